@@ -0,0 +1,92 @@
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import LRUCache
+
+# Поля пользователя, которых хватает для проверки прав. Остальные
+# поля у объекта из кэша отложены и догружаются при обращении.
+USER_FIELDS = ('id', 'username', 'role', 'is_staff', 'is_superuser',
+               'is_active')
+
+
+class AuthCache:
+    """Кэши CachedJWTAuthentication в памяти процесса.
+
+    tokens - проверенные токены по исходной строке, записи живут
+    не дольше самого токена; users - значения USER_FIELDS
+    по id пользователя, сбрасываются сигналами при сохранении
+    и удалении пользователя (api.signals). Изменения пользователя
+    в обход сигналов (queryset.update) видны не позже чем через TTL.
+    """
+
+    def __init__(self):
+        self.tokens = LRUCache(settings.JWT_AUTH_CACHE_SIZE,
+                               settings.JWT_AUTH_CACHE_TTL)
+        self.users = LRUCache(settings.JWT_AUTH_CACHE_SIZE,
+                              settings.JWT_AUTH_CACHE_TTL)
+
+    def user_changed(self, user_id):
+        self.users.delete(user_id)
+
+    def clear(self):
+        self.tokens.clear()
+        self.users.clear()
+
+
+auth_cache = AuthCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к базе на каждый запрос.
+
+    Подпись и срок действия токена проверяются один раз, дальше
+    токен берется из кэша. Пользователь собирается из закэшированных
+    USER_FIELDS как модель с отложенными остальными полями: is_admin,
+    is_moderator и сравнение с автором объекта работают без базы,
+    а save() такого объекта обновляет только загруженные поля.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = auth_cache.tokens.get(raw_token)
+        if validated_token is not None:
+            if validated_token['exp'] > time.time():
+                return validated_token
+            auth_cache.tokens.delete(raw_token)
+        validated_token = super().get_validated_token(raw_token)
+        auth_cache.tokens.set(raw_token, validated_token,
+                              validated_token['exp'] - time.time())
+        return validated_token
+
+    def get_user_fields(self):
+        """USER_FIELDS в порядке полей модели, как того ждет from_db()."""
+        return [field.attname
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in USER_FIELDS]
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя.')
+        fields = self.get_user_fields()
+        values = auth_cache.users.get(user_id)
+        if values is None:
+            values = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*fields).first()
+            if values is None:
+                raise AuthenticationFailed(
+                    'Пользователь не найден.', code='user_not_found')
+            auth_cache.users.set(user_id, values)
+        user = self.user_model.from_db(DEFAULT_DB_ALIAS, fields, values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive')
+        return user
@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import OrderedDict
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+HITS = 'titles:stats:hits'
+MISSES = 'titles:stats:misses'
+CATALOG_VERSION = 'titles:version:catalog'
+LIST_VERSION = 'titles:version:list'
+
+
+class TitlesCache:
+    """Кэш ответов на GET-запросы к произведениям.
+
+    Ключ ответа строится из пути, нормализованной строки запроса
+    (параметры отсортированы) и номеров версий. Вместо поиска
+    и удаления ключей при изменениях увеличивается номер версии:
+    - карточка произведения ключуется его полем version из базы,
+      тем же, что и ETag, поэтому тело и ETag всегда согласованы
+      между процессами;
+    - версия списков - при любом изменении произведений;
+    - версия каталога - при изменении жанров и категорий,
+      которые входят во все ответы.
+    Устаревшие записи вытесняются бэкендом по TTL. Если счетчик
+    версии пропал из кэша, он создается заново от текущего времени,
+    чтобы не совпасть со старыми ключами.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.TITLES_CACHE_ALIAS]
+
+    @property
+    def timeout(self):
+        return settings.TITLES_CACHE_TIMEOUT
+
+    @staticmethod
+    def normalize(request):
+        query = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        url = f'{request.get_host()}{request.path}?{urlencode(query)}'
+        return md5(url.encode()).hexdigest()
+
+    @staticmethod
+    def initial_version():
+        return time.time_ns() // 1000
+
+    def versions(self, *keys):
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                self.cache.add(key, self.initial_version(), None)
+                versions[key] = self.cache.get(key)
+        return [versions[key] for key in keys]
+
+    def list_key(self, request):
+        return 'titles:list:{}:{}:{}'.format(
+            *self.versions(CATALOG_VERSION, LIST_VERSION),
+            self.normalize(request)
+        )
+
+    def detail_key(self, request, version):
+        return 'titles:detail:{}:{}:{}'.format(
+            *self.versions(CATALOG_VERSION), version,
+            self.normalize(request)
+        )
+
+    def get(self, key):
+        data = self.cache.get(key)
+        self.count(MISSES if data is None else HITS)
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, self.timeout)
+
+    def count(self, counter):
+        try:
+            self.cache.incr(counter)
+        except ValueError:
+            self.cache.add(counter, 0, None)
+            self.cache.incr(counter)
+
+    def bump(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, self.initial_version(), None)
+
+    def titles_changed(self):
+        self.bump(LIST_VERSION)
+
+    def catalog_changed(self):
+        self.bump(CATALOG_VERSION)
+
+    def stats(self):
+        counters = self.cache.get_many([HITS, MISSES])
+        return {
+            'hits': counters.get(HITS, 0),
+            'misses': counters.get(MISSES, 0),
+        }
+
+
+class CountCache:
+    """Кэш результатов COUNT(*) для пагинации списков.
+
+    Ключ - хэш SQL-запроса с параметрами (то есть набора фильтров)
+    и номер поколения модели. Поколение увеличивается при сохранении
+    и удалении объектов модели, между изменениями количество
+    берется из кэша. Изменения в обход сигналов (bulk-операции,
+    связанные таблицы) становятся видны не позже чем через TTL.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.PAGINATION_COUNT_CACHE_ALIAS]
+
+    @property
+    def timeout(self):
+        return settings.PAGINATION_COUNT_CACHE_TIMEOUT
+
+    @staticmethod
+    def generation_key(model):
+        return f'count:generation:{model._meta.label_lower}'
+
+    def key(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        digest = md5(f'{sql}{params!r}'.encode()).hexdigest()
+        label = queryset.model._meta.label_lower
+        generation = self.cache.get(self.generation_key(queryset.model), 0)
+        return f'count:{label}:{generation}:{digest}'
+
+    def get_count(self, queryset):
+        key = self.key(queryset)
+        count = self.cache.get(key)
+        if count is None:
+            count = queryset.count()
+            self.cache.set(key, count, self.timeout)
+        return count
+
+    def model_changed(self, model):
+        key = self.generation_key(model)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, TitlesCache.initial_version(), None)
+
+
+titles_cache = TitlesCache()
+count_cache = CountCache()
+
+
+class LRUCache:
+    """Ограниченный по размеру кэш в памяти процесса с TTL.
+
+    Для горячих данных, которые нужны на каждом запросе и не стоят
+    похода в бэкенд кэша. При переполнении вытесняется запись,
+    к которой дольше всего не обращались. Потокобезопасен.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return default
+            value, expires = item
+            if expires <= time.monotonic():
+                del self.data[key]
+                return default
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self.lock:
+            self.data[key] = (value, time.monotonic() + ttl)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
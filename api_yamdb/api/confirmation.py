@@ -0,0 +1,97 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from reviews.models import ConfirmationCode
+from reviews.utils import chunks
+
+
+class ConfirmationCodes:
+    """Хранилище кодов подтверждения для получения токена.
+
+    Код живет в таблице ConfirmationCode не дольше
+    CONFIRMATION_CODE_TIMEOUT секунд, хранится только его HMAC
+    и удаляется при первом успешном использовании. Строку
+    пользователя для этого перезаписывать не нужно.
+    """
+
+    @property
+    def timeout(self):
+        return settings.CONFIRMATION_CODE_TIMEOUT
+
+    @staticmethod
+    def digest(code):
+        return salted_hmac('api.confirmation', str(code)).hexdigest()
+
+    def expires_at(self):
+        return timezone.now() + timedelta(seconds=self.timeout)
+
+    def issue(self, username):
+        """Выдаем новый код, предыдущий код пользователя перестает
+        действовать.
+
+        При повторной регистрации это один UPDATE, запись создается,
+        только если кода у пользователя еще нет. Истекшие коды
+        удаляет команда purge_confirmation_codes.
+        """
+        code = uuid.uuid4().hex
+        values = {'digest': self.digest(code),
+                  'expires_at': self.expires_at()}
+        codes = ConfirmationCode.objects.filter(username=username)
+        if not codes.update(**values):
+            try:
+                with transaction.atomic():
+                    ConfirmationCode.objects.create(
+                        username=username, **values)
+            except IntegrityError:
+                # Запись успел создать параллельный запрос.
+                codes.update(**values)
+        return code
+
+    def issue_many(self, usernames):
+        """Выдаем коды сразу пачке пользователей: старые коды удаляются
+        и новые вставляются пачками. Возвращает словарь {username: код}.
+        """
+        codes = {username: uuid.uuid4().hex for username in usernames}
+        expires_at = self.expires_at()
+        with transaction.atomic():
+            for chunk in chunks(codes):
+                ConfirmationCode.objects.filter(
+                    username__in=chunk).delete()
+            ConfirmationCode.objects.bulk_create(
+                ConfirmationCode(username=username, digest=self.digest(code),
+                                 expires_at=expires_at)
+                for username, code in codes.items()
+            )
+        return codes
+
+    def consume(self, username, code):
+        """Проверяем код и сразу гасим его одним DELETE.
+
+        Из двух одновременных запросов с верным кодом успешен
+        только тот, который удалил запись.
+        """
+        deleted, _ = ConfirmationCode.objects.filter(
+            username=username,
+            digest=self.digest(code),
+            expires_at__gt=timezone.now(),
+        ).delete()
+        return deleted > 0
+
+    def purge_expired(self):
+        """Удаляем истекшие коды, возвращаем их количество."""
+        deleted, _ = ConfirmationCode.objects.filter(
+            expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+confirmation_codes = ConfirmationCodes()
+
+
+def confirmation_email(code):
+    """Тема и текст письма с кодом подтверждения."""
+    return 'Код подтверждения', f'{code} - Код для авторизации на сайте'
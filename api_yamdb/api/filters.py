@@ -1,6 +1,19 @@
+from django import forms
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+from reviews.search import get_search_backend
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по списку значений через запятую: ?genre=drama,comedy."""
+
+
+class IntegerFilter(filters.NumberFilter):
+    """Числовой фильтр, который принимает только целые числа."""
+    field_class = forms.IntegerField
 
 
 class TitlesFilter(filters.FilterSet):
@@ -8,20 +21,77 @@ class TitlesFilter(filters.FilterSet):
     для полей "category" и "genre".
 
     Создаем класс TitlesFilter, который наследуется от filters.FilterSet.
-    Внутри этого класса мы определяем два поля фильтрации:
-    category_slug и genre_slug.
-    Оператор сравнения lookup_expr='icontains' будет искать
-    небходимые данные среди записей.
+    Поля category и genre принимают один или несколько slug через
+    запятую и сравнивают их точно, чтобы работал уникальный индекс.
+    Для жанров параметр genre_mode задает, должны совпасть все
+    жанры (all) или хотя бы один (any, по умолчанию). Жанры
+    проверяются подзапросами EXISTS по GenreTitle, поэтому
+    произведения в выдаче не дублируются.
+    Поиск по подстроке slug оставлен в category_contains
+    и genre_contains (lookup_expr='icontains').
+    Поле name ищет подстроку в названии (icontains), поиск по словам
+    через индекс - параметр search (TitleSearchFilter).
+    Год сравнивается как целое число (year, year_min, year_max),
+    что позволяет использовать индекс по (year, name).
     """
-    category = filters.CharFilter(field_name='category__slug',
-                                  lookup_expr='icontains')
-    genre = filters.CharFilter(field_name='genre__slug',
-                               lookup_expr='icontains')
-    name = filters.CharFilter(field_name='name',
-                              lookup_expr='icontains')
-    year = filters.CharFilter(field_name='year',
-                              lookup_expr='icontains')
+    GENRE_MODES = (('any', 'any'), ('all', 'all'))
+
+    category = CharInFilter(field_name='category__slug', lookup_expr='in')
+    category_contains = filters.CharFilter(field_name='category__slug',
+                                           lookup_expr='icontains')
+    genre = CharInFilter(method='filter_genre')
+    genre_mode = filters.ChoiceFilter(choices=GENRE_MODES,
+                                      method='filter_genre_mode')
+    genre_contains = filters.CharFilter(method='filter_genre_contains')
+    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    year = IntegerFilter(field_name='year')
+    year_min = IntegerFilter(field_name='year', lookup_expr='gte')
+    year_max = IntegerFilter(field_name='year', lookup_expr='lte')
 
     class Meta:
         model = Title
         fields = ['category', 'genre', 'name', 'year']
+
+    @staticmethod
+    def genre_exists(**lookups):
+        return Exists(GenreTitle.objects.filter(title=OuterRef('pk'),
+                                                **lookups))
+
+    def filter_genre(self, queryset, name, value):
+        if self.form.cleaned_data.get('genre_mode') == 'all':
+            for slug in set(value):
+                queryset = queryset.filter(
+                    self.genre_exists(genre__slug=slug))
+            return queryset
+        return queryset.filter(self.genre_exists(genre__slug__in=value))
+
+    def filter_genre_mode(self, queryset, name, value):
+        """Режим учитывается в filter_genre."""
+        return queryset
+
+    def filter_genre_contains(self, queryset, name, value):
+        return queryset.filter(
+            self.genre_exists(genre__slug__icontains=value))
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по названию и описанию произведения.
+
+    Параметр search передается в поисковый бэкенд (reviews.search),
+    результат сортируется по релевантности.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
+
+
+class FeedFilter(filters.FilterSet):
+    """Лента публикаций: ?since=<дата ISO 8601> оставляет
+    опубликованные строго позже указанного момента.
+    """
+    since = filters.IsoDateTimeFilter(field_name='pub_date',
+                                      lookup_expr='gt')
@@ -0,0 +1,83 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitlesSerializer, TitlesValuesSerializer
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+class Command(BaseCommand):
+    help = ('Сравнение скорости TitlesSerializer и TitlesValuesSerializer '
+            'на странице списка произведений')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--limit', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        """Тестовые данные создаются в транзакции, которая
+        в конце откатывается, база остается без изменений.
+        """
+        with transaction.atomic():
+            self.create_data(options['titles'])
+            queryset = Title.objects.all().select_related(
+                'category').prefetch_related('genre').order_by('id')
+            limit = options['limit']
+
+            def serializer_page():
+                return TitlesSerializer(queryset[:limit], many=True).data
+
+            def values_page():
+                rows = list(TitlesValuesSerializer.values(queryset)[:limit])
+                return TitlesValuesSerializer(rows).data
+
+            assert json.dumps(serializer_page()) == json.dumps(
+                values_page()), 'Результаты сериализаторов отличаются.'
+            for name, page in (('TitlesSerializer', serializer_page),
+                               ('TitlesValuesSerializer', values_page)):
+                self.measure(name, page, options['repeat'])
+            transaction.set_rollback(True)
+
+    def measure(self, name, page, repeat):
+        with CaptureQueriesContext(connection) as queries:
+            page()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            page()
+        elapsed = (time.perf_counter() - started) / repeat * 1000
+        self.stdout.write(
+            f'{name}: {elapsed:.2f} мс на страницу, '
+            f'запросов: {len(queries)}')
+
+    @staticmethod
+    def create_data(count):
+        categories = Category.objects.bulk_create(
+            Category(name=f'Категория {idx}', slug=f'bench-category-{idx}')
+            for idx in range(5)
+        )
+        genres = Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'bench-genre-{idx}')
+            for idx in range(10)
+        )
+        if not connection.features.can_return_rows_from_bulk_insert:
+            categories = list(Category.objects.filter(
+                slug__startswith='bench-category-'))
+            genres = list(Genre.objects.filter(
+                slug__startswith='bench-genre-'))
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=1900 + idx % 120,
+                  description='Описание ' * 20,
+                  category=categories[idx % len(categories)],
+                  rating=idx % 11)
+            for idx in range(count)
+        )
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title_id,
+                       genre=genres[(title_id + shift) % len(genres)])
+            for title_id in Title.objects.values_list('id', flat=True)
+            for shift in range(3)
+        )
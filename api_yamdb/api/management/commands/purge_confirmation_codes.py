@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.confirmation import confirmation_codes
+
+
+class Command(BaseCommand):
+    help = 'Удаление истекших кодов подтверждения'
+
+    def handle(self, *args, **kwargs):
+        """Запускается по расписанию, чтобы регистрация
+        не чистила таблицу кодов на каждом запросе.
+        """
+        deleted = confirmation_codes.purge_expired()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено истекших кодов: {deleted}.'))
@@ -0,0 +1,318 @@
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import count_cache
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу (keyset) с непрозрачным курсором.
+
+    Вместо OFFSET запрос продолжается с позиции последней записи
+    страницы: WHERE (поле1, поле2) > (значение1, значение2).
+    Поэтому стоимость любой страницы одинакова при наличии индекса
+    на полях сортировки, а общий COUNT не выполняется.
+
+    Порядок задается кортежем полей в ordering, последнее поле должно
+    быть уникальным. Поля могут допускать NULL: такие записи идут
+    в конце выдачи. Вьюсет может задать несколько вариантов порядка
+    в keyset_orderings, клиент выбирает их параметром ordering.
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    ordering_query_param = 'ordering'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    ordering = ('-id',)
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+        self.has_cursor = position is not None
+
+        order = self.get_order_by(queryset.model, reverse=self.reverse)
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(self.after(position, self.reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, request, view):
+        orderings = getattr(view, 'keyset_orderings', None)
+        if not orderings:
+            return self.ordering
+        name = request.query_params.get(self.ordering_query_param)
+        return orderings.get(name, next(iter(orderings.values())))
+
+    def get_order_by(self, model, reverse=False):
+        """Выражения сортировки, NULL всегда в конце прямого порядка.
+
+        Модификатор NULLS добавляется только к полям, допускающим NULL,
+        чтобы не мешать использованию индекса для остальных.
+        """
+        order_by = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            if not model._meta.get_field(name).null:
+                order_by.append(F(name).desc() if descending
+                                else F(name).asc())
+                continue
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            order_by.append(F(name).desc(**nulls) if descending
+                            else F(name).asc(**nulls))
+        return order_by
+
+    def after(self, position, reverse=False):
+        """Условие "строго после позиции" для выбранного направления."""
+        condition = Q(pk__in=[])
+        for index in reversed(range(len(self.ordering))):
+            field = self.ordering[index]
+            name = field.lstrip('-')
+            value = position[index]
+            equal = Q(**{f'{name}__isnull': True}) if value is None else Q(
+                **{name: value})
+            condition = self.beyond(field, value, reverse) | (
+                equal & condition)
+        return condition
+
+    def beyond(self, field, value, reverse):
+        name = field.lstrip('-')
+        if not reverse:
+            if value is None:
+                return Q(pk__in=[])
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            return (Q(**{f'{name}__{lookup}': value})
+                    | Q(**{f'{name}__isnull': True}))
+        if value is None:
+            return Q(**{f'{name}__isnull': False})
+        lookup = 'gt' if field.startswith('-') else 'lt'
+        return Q(**{f'{name}__{lookup}': value})
+
+    def get_position(self, instance):
+        """Позиция записи: модель или словарь из queryset.values()."""
+        if isinstance(instance, dict):
+            return [instance[field.lstrip('-')] for field in self.ordering]
+        return [getattr(instance, field.lstrip('-'))
+                for field in self.ordering]
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')).decode())
+            position, reverse = data['p'], bool(data['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+                len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        return self.clean_position(position, model), reverse
+
+    def clean_position(self, position, model):
+        """Приводим значения курсора к типам полей сортировки, чтобы
+        подделанный курсор давал 404, а не ошибку в запросе к базе.
+        """
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            model_field = model._meta.get_field(field.lstrip('-'))
+            if value is None:
+                if not model_field.null:
+                    raise NotFound(self.invalid_cursor_message)
+                cleaned.append(None)
+                continue
+            if isinstance(value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                cleaned.append(model_field.to_python(value))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        return cleaned
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({'p': position, 'r': reverse},
+                          default=str, separators=(',', ':'))
+        encoded = b64encode(data.encode()).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.page:
+            return None
+        if self.reverse or self.has_following:
+            return self.encode_cursor(self.get_position(self.page[-1]), False)
+        return None
+
+    def get_previous_link(self):
+        if not self.has_cursor:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        if not self.reverse or self.has_following:
+            return self.encode_cursor(self.get_position(self.page[0]), True)
+        return None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class LeaderboardPagination(KeysetPagination):
+    """Курсор по рейтингу лучших: оценка по убыванию, при равенстве
+    произведение. Порядок фиксирован и не зависит от вьюсета.
+    """
+    ordering = ('-score', '-title_id')
+
+    def get_ordering(self, request, view):
+        return self.ordering
+
+
+class CountFreeLimitOffsetPagination(LimitOffsetPagination):
+    """limit/offset без COUNT(*).
+
+    Из базы берется limit + 1 строка: лишняя строка показывает,
+    есть ли следующая страница. Вместо count в ответе флаг has_next.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        self.count = None
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('has_next', self.has_next),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'has_next': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+
+class CachedCountLimitOffsetPagination(CountFreeLimitOffsetPagination):
+    """limit/offset с количеством записей из кэша (api.cache.count_cache).
+
+    Формат ответа как у LimitOffsetPagination. На последней странице
+    количество известно без запроса: offset + число строк.
+    С параметром count=false подсчет не выполняется вовсе,
+    ответ как у CountFreeLimitOffsetPagination.
+    """
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view)
+        if page is None or not self.count_requested(request):
+            return page
+        if not self.has_next and (page or self.offset == 0):
+            self.count = self.offset + len(page)
+        else:
+            self.count = count_cache.get_count(queryset)
+        return page
+
+    def count_requested(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() not in ('0', 'false', 'no')
+
+    def get_paginated_response(self, data):
+        if self.count is None:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class OffsetOrKeysetPagination(BasePagination):
+    """Выбор пагинации по параметрам запроса.
+
+    По умолчанию работает пагинация limit/offset, как и раньше,
+    с количеством записей из кэша. Если передан cursor или
+    pagination=cursor, включается KeysetPagination без подсчета
+    общего количества записей.
+    """
+    mode_query_param = 'pagination'
+    offset_class = CachedCountLimitOffsetPagination
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (self.keyset_class.cursor_query_param in request.query_params
+                or request.query_params.get(self.mode_query_param)
+                == 'cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.paginator = self.keyset_class()
+        else:
+            self.paginator = self.offset_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
@@ -12,6 +12,13 @@ class IsAdmin(permissions.BasePermission):
                 and request.user.is_admin)
 
 
+class IsAdminOrModerator(permissions.BasePermission):
+    """Доступно только администратору и модератору."""
+    def has_permission(self, request, view):
+        return (request.user.is_authenticated
+                and (request.user.is_admin or request.user.is_moderator))
+
+
 class IsOwnerAdminModeratorOrReadOnly(permissions.BasePermission):
     """Доступно для создателя объекта, администратора, модератора,
     остальным только для чтения."""
@@ -0,0 +1,96 @@
+from django.db import transaction
+
+from api_yamdb.settings import ADMIN_EMAIL
+from reviews import outbox
+from reviews.models import User
+from reviews.utils import CHUNK_SIZE, chunks
+from .confirmation import confirmation_codes, confirmation_email
+from .serializers import UserProvisionSerializer
+
+UNIQUE_FIELDS = ('username', 'email')
+UNIQUE_MESSAGES = {
+    'username': 'Пользователь с таким именем уже существует.',
+    'email': 'Пользователь с таким Email уже существует.',
+}
+
+
+def validate_rows(rows):
+    """Проверяем строки по отдельности, без запросов к базе.
+
+    Возвращает список ошибок по строкам (None для верной строки)
+    и список пар (номер строки, проверенные данные).
+    """
+    errors, valid = [None] * len(rows), []
+    for index, row in enumerate(rows):
+        serializer = UserProvisionSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors[index] = serializer.errors
+    return errors, valid
+
+
+def taken_values(field, values):
+    """Значения поля, уже занятые в базе: один запрос IN на пачку
+    значений, пачки не упираются в лимит параметров SQLite.
+    """
+    taken = set()
+    for chunk in chunks(values):
+        taken.update(User.objects.filter(
+            **{f'{field}__in': chunk}).values_list(field, flat=True))
+    return taken
+
+
+def check_unique(valid, errors):
+    """Отсеиваем строки с занятыми username или email.
+
+    Повтор внутри пачки ищется в памяти (выигрывает первая строка),
+    занятые в базе значения - одним запросом на каждое поле.
+    """
+    taken = {
+        field: taken_values(field, {data[field] for _, data in valid})
+        for field in UNIQUE_FIELDS
+    }
+    unique = []
+    for index, data in valid:
+        row_errors = {
+            field: [UNIQUE_MESSAGES[field]] for field in UNIQUE_FIELDS
+            if data[field] in taken[field]
+        }
+        if row_errors:
+            errors[index] = row_errors
+            continue
+        for field in UNIQUE_FIELDS:
+            taken[field].add(data[field])
+        unique.append((index, data))
+    return unique
+
+
+def provision_users(rows, send_codes=False):
+    """Массовое создание пользователей администратором.
+
+    Пользователи создаются через bulk_create пачками в одной
+    транзакции. Если send_codes, каждому выдается код подтверждения
+    и в очередь кладется письмо, как при регистрации.
+    Возвращает результат по каждой строке в исходном порядке.
+    """
+    errors, valid = validate_rows(rows)
+    unique = check_unique(valid, errors)
+    with transaction.atomic():
+        User.objects.bulk_create(
+            (User(**data) for _, data in unique), batch_size=CHUNK_SIZE)
+        if send_codes and unique:
+            codes = confirmation_codes.issue_many(
+                data['username'] for _, data in unique)
+            outbox.enqueue_many((
+                (*confirmation_email(codes[data['username']]),
+                 [data['email']])
+                for _, data in unique
+            ), from_email=ADMIN_EMAIL)
+    results = [
+        {'status': 'error', 'errors': row_errors}
+        for row_errors in errors
+    ]
+    for index, data in unique:
+        results[index] = {'status': 'created', 'username': data['username']}
+    return results
@@ -1,12 +1,64 @@
 from datetime import date
 
+from django.db import connection, transaction
+from django.db.models import prefetch_related_objects
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.validators import UniqueTogetherValidator
 
-from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
-                            Title, User)
+from reviews.models import (Category, Comment, Genre, GenreTitle,
+                            LeaderboardEntry, Review, Title, User)
+from reviews.search import get_search_backend
 from reviews.validators import validate_username
 
+MAX_BULK_TITLES = 1000
+MAX_BULK_MODERATION = 10000
+MAX_BULK_USERS = 10000
+
+
+class SparseFieldsMixin:
+    """Выбор полей ответа параметрами запроса fields и omit.
+
+    ?fields=id,name оставляет только перечисленные поля,
+    ?omit=description убирает указанные. Работает только для
+    безопасных методов, чтобы не влиять на валидацию при записи.
+    Вьюсеты используют get_requested_fields(), чтобы не загружать
+    из базы то, что не попадет в ответ.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    @staticmethod
+    def parse_names(value):
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        names = list(cls.Meta.fields)
+        if request is None or request.method not in SAFE_METHODS:
+            return names
+        fields = cls.parse_names(
+            request.query_params.get(cls.fields_query_param, ''))
+        omit = cls.parse_names(
+            request.query_params.get(cls.omit_query_param, ''))
+        unknown = (fields | omit) - set(names)
+        if unknown:
+            raise serializers.ValidationError({
+                cls.fields_query_param: [
+                    'Неизвестные поля: {}.'.format(', '.join(sorted(unknown)))
+                ]
+            })
+        return [name for name in names
+                if (not fields or name in fields) and name not in omit]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = set(self.get_requested_fields(self.context.get('request')))
+        for name in list(self.fields):
+            if name not in requested:
+                self.fields.pop(name)
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Сериализатор модели User."""
@@ -16,6 +68,35 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
 
 
+class UserProvisionSerializer(serializers.Serializer):
+    """Одна строка массового создания пользователей.
+
+    В отличие от UserSerializer не проверяет уникальность запросом
+    на каждую строку: это делается для всей пачки сразу.
+    """
+    username = serializers.CharField(
+        max_length=150,
+        validators=[validate_username])
+    email = serializers.EmailField(max_length=254)
+    first_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True)
+    bio = serializers.CharField(required=False, allow_blank=True)
+    role = serializers.ChoiceField(
+        choices=User._meta.get_field('role').choices, required=False)
+
+
+class BulkUsersSerializer(serializers.Serializer):
+    """Пачка пользователей для массового создания. Строки проверяются
+    по отдельности, ошибка в одной строке не отменяет остальные.
+    """
+    users = serializers.ListField(
+        allow_empty=False,
+        max_length=MAX_BULK_USERS)
+    send_codes = serializers.BooleanField(default=False)
+
+
 class SignupSerializer(serializers.Serializer):
     """Сериализация данных пользователя при регистрации."""
     email = serializers.EmailField(required=True, max_length=254)
@@ -26,6 +107,30 @@ class SignupSerializer(serializers.Serializer):
     )
 
 
+class BulkModerationSerializer(serializers.Serializer):
+    """Что удалить при массовой модерации: списки отзывов
+    и комментариев и/или все публикации автора.
+    """
+    reviews = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_BULK_MODERATION)
+    comments = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_BULK_MODERATION)
+    author = serializers.SlugRelatedField(
+        slug_field='username',
+        queryset=User.objects.all(),
+        required=False)
+
+    def validate(self, data):
+        if not any(data.get(name) for name in self.fields):
+            raise serializers.ValidationError(
+                'Укажите reviews, comments или author.')
+        return data
+
+
 class TokenSerializer(serializers.Serializer):
     """Сериализация данных для получения токена."""
     username = serializers.CharField(
@@ -50,7 +155,7 @@ class GenresSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitlesSerializer(serializers.ModelSerializer):
+class TitlesSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для получения обьектов Titles.
 
     Обрабатывет:
@@ -59,9 +164,7 @@ class TitlesSerializer(serializers.ModelSerializer):
     """
     genre = GenresSerializer(many=True)
     category = CategoriesSerializer()
-    rating = serializers.IntegerField(
-        source='reviews__score__avg', read_only=True
-    )
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
@@ -72,6 +175,201 @@ class TitlesSerializer(serializers.ModelSerializer):
         }
 
 
+class LeaderboardSerializer(serializers.ModelSerializer):
+    """Место в рейтинге лучших: байесовская оценка и произведение."""
+    title = TitlesSerializer(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('score', 'title')
+
+
+class TitlesValuesSerializer:
+    """Быстрая сериализация списка произведений для GET-запросов.
+
+    Работает со строками queryset.values(fields) вместо моделей:
+    жанры всех произведений страницы загружаются одним запросом
+    по GenreTitle, ответ собирается из обычных словарей.
+    Результат совпадает с TitlesSerializer(many=True).data,
+    в том числе с учетом параметров fields и omit.
+    """
+    columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category__name', 'category__slug'),
+    }
+    required_columns = ('id', 'rating')
+
+    def __init__(self, rows, fields=TitlesSerializer.Meta.fields):
+        self.rows = rows
+        self.fields = fields
+
+    @classmethod
+    def values(cls, queryset, fields=TitlesSerializer.Meta.fields):
+        """Выбираем только колонки запрошенных полей.
+
+        id нужен для жанров, id и rating - для пагинации по ключу.
+        """
+        columns = dict.fromkeys(cls.required_columns)
+        for name in fields:
+            columns.update(dict.fromkeys(cls.columns[name]))
+        return queryset.prefetch_related(None).values(*columns)
+
+    def get_genres(self):
+        genres = {row['id']: [] for row in self.rows}
+        if not genres or 'genre' not in self.fields:
+            return genres
+        links = GenreTitle.objects.filter(
+            title_id__in=genres, genre__isnull=False
+        ).order_by('id').values_list('title_id', 'genre__name', 'genre__slug')
+        for title_id, name, slug in links:
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    def to_representation(self, row, genres):
+        data = {}
+        for name in self.fields:
+            if name == 'genre':
+                data[name] = genres[row['id']]
+            elif name == 'category':
+                data[name] = None if row['category__slug'] is None else {
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                }
+            else:
+                data[name] = row[name]
+        return data
+
+    @property
+    def data(self):
+        genres = self.get_genres()
+        return [self.to_representation(row, genres) for row in self.rows]
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField для массовой загрузки.
+
+    Если корневой сериализатор заранее загрузил объекты по slug
+    (атрибут prefetched_slugs), берем их из словаря без запроса в базу.
+    """
+    def to_internal_value(self, data):
+        prefetched = getattr(self.root, 'prefetched_slugs', None)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return prefetched[self.queryset.model][data]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+        except TypeError:
+            self.fail('invalid')
+
+
+class TitlesBulkSerializer(serializers.ListSerializer):
+    """Массовое создание произведений одним запросом.
+
+    Вместо запросов на каждый элемент:
+    - все slug жанров и категорий загружаются одним запросом на модель;
+    - уникальность (name, year) проверяется одним запросом
+      и внутри самой пачки;
+    - произведения и связи GenreTitle создаются через bulk_create
+      в одной транзакции.
+    Ошибки возвращаются списком, по одному элементу на каждый объект.
+    """
+    unique_message = 'Такое произведение уже существует.'
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+        if len(data) > MAX_BULK_TITLES:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    f'Можно создать не больше {MAX_BULK_TITLES} '
+                    'произведений за один запрос.'
+                ]
+            })
+        self.prefetched_slugs = self.prefetch_slugs(data)
+        validated_data = super().to_internal_value(data)
+        self.validate_unique(validated_data)
+        return validated_data
+
+    @staticmethod
+    def prefetch_slugs(data):
+        genres, categories = set(), set()
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            slugs = item.get('genre')
+            if isinstance(slugs, list):
+                genres.update(slug for slug in slugs if isinstance(slug, str))
+            if isinstance(item.get('category'), str):
+                categories.add(item['category'])
+        return {
+            Genre: Genre.objects.in_bulk(genres, field_name='slug'),
+            Category: Category.objects.in_bulk(categories, field_name='slug'),
+        }
+
+    def validate_unique(self, validated_data):
+        keys = [(item['name'], item['year']) for item in validated_data]
+        existing = set(Title.objects.filter(
+            name__in={name for name, _ in keys},
+            year__in={year for _, year in keys}
+        ).values_list('name', 'year'))
+        errors, seen = [], set()
+        for key in keys:
+            if key in existing or key in seen:
+                errors.append({'non_field_errors': [self.unique_message]})
+            else:
+                errors.append({})
+            seen.add(key)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+    def create(self, validated_data):
+        titles, genres = [], []
+        for item in validated_data:
+            item = dict(item)
+            genres.append(dict.fromkeys(item.pop('genre', [])))
+            titles.append(Title(**item))
+        with transaction.atomic():
+            self.insert(titles)
+            GenreTitle.objects.bulk_create(
+                GenreTitle(title=title, genre=genre)
+                for title, title_genres in zip(titles, genres)
+                for genre in title_genres
+            )
+            get_search_backend().index_many(titles)
+        prefetch_related_objects(titles, 'genre')
+        return titles
+
+    @staticmethod
+    def insert(titles):
+        """Вставляем произведения и заполняем их pk.
+
+        PostgreSQL возвращает pk из bulk_create. SQLite в Django 3.2
+        этого не умеет, но после первой вставки транзакция держит
+        блокировку записи до фиксации, а rowid выдаются подряд
+        от максимального: новые строки - последние len(titles) pk.
+        На остальных базах сохраняем по одной.
+        """
+        if connection.features.can_return_rows_from_bulk_insert:
+            Title.objects.bulk_create(titles)
+        elif connection.vendor == 'sqlite':
+            Title.objects.bulk_create(titles)
+            last = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True).first()
+            for pk, title in zip(
+                    range(last - len(titles) + 1, last + 1), titles):
+                title.pk = pk
+        else:
+            for title in titles:
+                title.save()
+
+
 class TitlesPostSerializer(serializers.ModelSerializer):
     """Сериализатор для создания или обновления обьектов Titles.
 
@@ -82,13 +380,16 @@ class TitlesPostSerializer(serializers.ModelSerializer):
 
     Заданы уникальные поля для избежания создания одинаковых
     произведений с помощью UniqueTogetherValidator.
+
+    POST-запрос со списком объектов обрабатывает TitlesBulkSerializer,
+    в этом случае уникальность проверяется сразу для всей пачки.
     """
-    genre = serializers.SlugRelatedField(
+    genre = PrefetchedSlugRelatedField(
         many=True,
         slug_field='slug',
         queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = PrefetchedSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -100,6 +401,7 @@ class TitlesPostSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'description': {'required': False}
         }
+        list_serializer_class = TitlesBulkSerializer
 
         validators = [
             UniqueTogetherValidator(
@@ -109,6 +411,11 @@ class TitlesPostSerializer(serializers.ModelSerializer):
             )
         ]
 
+    def get_validators(self):
+        if isinstance(self.parent, TitlesBulkSerializer):
+            return []
+        return super().get_validators()
+
     def validate_year(self, value):
         """Проверяем что год выпуска не может быть больше текущего
         или отрицательным.
@@ -129,19 +436,21 @@ class GenreTitleSerializer(serializers.ModelSerializer):
         model = GenreTitle
 
 
-class ReviewsSerializer(serializers.ModelSerializer):
+class ReviewsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели Reviews."""
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
     )
+    comments_count = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comments_count')
         model = Review
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели Comments."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -151,3 +460,23 @@ class CommentsSerializer(serializers.ModelSerializer):
     class Meta:
         fields = ('id', 'text', 'author', 'pub_date')
         model = Comment
+
+
+class ReviewsFeedSerializer(ReviewsSerializer):
+    """Отзыв в общей ленте: с идентификатором произведения."""
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(ReviewsSerializer.Meta):
+        fields = ReviewsSerializer.Meta.fields + ('title',)
+
+
+class CommentsFeedSerializer(CommentsSerializer):
+    """Комментарий в общей ленте: с отзывом и его произведением.
+
+    Произведение берется из аннотации title_id, без загрузки отзыва.
+    """
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+    title = serializers.IntegerField(source='title_id', read_only=True)
+
+    class Meta(CommentsSerializer.Meta):
+        fields = CommentsSerializer.Meta.fields + ('review', 'title')
@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from .authentication import auth_cache
+from .cache import count_cache, titles_cache
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def titles_changed(sender, **kwargs):
+    """Карточки произведений ключуются версией из базы,
+    здесь сбрасываются только списки.
+    """
+    transaction.on_commit(titles_cache.titles_changed)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, **kwargs):
+    """Жанры меняются через title.genre.set() без сигналов post_save."""
+    if kwargs['action'].startswith('post_'):
+        transaction.on_commit(titles_cache.titles_changed)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def catalog_changed(sender, **kwargs):
+    transaction.on_commit(titles_cache.catalog_changed)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def counted_model_changed(sender, **kwargs):
+    """Сбрасываем закэшированные COUNT(*) для списков модели."""
+    transaction.on_commit(lambda: count_cache.model_changed(sender))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_links_changed(sender, **kwargs):
+    """От связей с жанрами зависит фильтр произведений по жанру."""
+    transaction.on_commit(lambda: count_cache.model_changed(Title))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Роль и активность пользователя берутся из кэша аутентификации.
+
+    Запись сбрасывается сразу и еще раз после фиксации транзакции,
+    чтобы параллельный запрос не закэшировал старые данные.
+    """
+    auth_cache.user_changed(instance.pk)
+    transaction.on_commit(lambda: auth_cache.user_changed(instance.pk))
@@ -0,0 +1,136 @@
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+from .cache import LRUCache
+
+KEY = 'throttle:{}:{}'
+
+
+class BucketStorage:
+    """Хранилище корзин маркеров (token bucket).
+
+    Корзина вмещает capacity маркеров и пополняется со скоростью
+    rate маркеров в секунду, каждый запрос забирает один маркер.
+    Состояние корзины - (маркеры, время), проверка стоит O(1).
+    Полная корзина не отличается от отсутствующей, поэтому запись
+    живет только до полного пополнения.
+    """
+
+    def load(self, key):
+        raise NotImplementedError
+
+    def save(self, key, state, ttl):
+        raise NotImplementedError
+
+    def clear(self):
+        pass
+
+    def consume(self, key, capacity, rate):
+        """Забираем маркер. Возвращает None, если запрос разрешен,
+        иначе сколько секунд ждать следующего маркера.
+        """
+        now = time.time()
+        state = self.load(key)
+        tokens = capacity
+        if state is not None:
+            tokens, stamp = state
+            tokens = min(capacity, tokens + (now - stamp) * rate)
+        if tokens < 1:
+            return (1 - tokens) / rate
+        tokens -= 1
+        self.save(key, (tokens, now), (capacity - tokens) / rate)
+        return None
+
+
+class LocalBucketStorage(BucketStorage):
+    """Корзины в памяти процесса: самый быстрый вариант, но лимиты
+    считаются отдельно в каждом процессе. Число корзин ограничено
+    THROTTLE_LOCAL_MAX_KEYS, дольше всех не использованные вытесняются.
+    """
+
+    def __init__(self):
+        self.buckets = LRUCache(settings.THROTTLE_LOCAL_MAX_KEYS,
+                                float('inf'))
+        self.lock = threading.Lock()
+
+    def load(self, key):
+        return self.buckets.get(key)
+
+    def save(self, key, state, ttl):
+        self.buckets.set(key, state, ttl)
+
+    def consume(self, key, capacity, rate):
+        with self.lock:
+            return super().consume(key, capacity, rate)
+
+    def clear(self):
+        self.buckets.clear()
+
+
+class CacheBucketStorage(BucketStorage):
+    """Корзины в общем кэше THROTTLE_CACHE_ALIAS, лимиты общие
+    для всех процессов. Чтение и запись не атомарны, при гонке
+    параллельные запросы могут получить лишний маркер.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def load(self, key):
+        return self.cache.get(key)
+
+    def save(self, key, state, ttl):
+        self.cache.set(key, state, ttl)
+
+
+@lru_cache(maxsize=None)
+def get_bucket_storage():
+    """Хранилище из настройки THROTTLE_STORAGE."""
+    return import_string(settings.THROTTLE_STORAGE)()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение частоты запросов корзиной маркеров.
+
+    Параметры корзины берутся из THROTTLE_BUCKETS[scope]. Ключ -
+    пользователь, а для анонимных запросов - IP-адрес. Если задан
+    methods, ограничиваются только запросы с этими методами.
+    """
+    scope = None
+    methods = None
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.delay = None
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        bucket = settings.THROTTLE_BUCKETS[self.scope]
+        self.delay = get_bucket_storage().consume(
+            KEY.format(self.scope, self.get_ident_key(request)),
+            bucket['capacity'], bucket['rate'])
+        return self.delay is None
+
+    def wait(self):
+        return self.delay
+
+
+class AuthThrottle(TokenBucketThrottle):
+    """Регистрация и получение токена."""
+    scope = 'auth'
+
+
+class WriteThrottle(TokenBucketThrottle):
+    """Создание и изменение отзывов и комментариев."""
+    scope = 'write'
+    methods = ('POST', 'PATCH')
@@ -1,16 +1,18 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoriesViewSet, CommentsViewSet, GenresViewSet,
-                    ReviewsViewSet, TitlesViewSet, UserViewSet, signup, token)
+from .views import (CategoriesViewSet, CommentsFeedViewSet,
+                    CommentsViewSet, GenresViewSet, ReviewsFeedViewSet,
+                    ReviewsViewSet, TitlesViewSet, UserViewSet,
+                    bulk_create_users, bulk_moderation, signup, token)
 
 v1_router = DefaultRouter()
 
 v1_router.register(r'categories', CategoriesViewSet, basename='categories')
 v1_router.register(r'genres', GenresViewSet, basename='genres')
 v1_router.register(r'titles', TitlesViewSet, basename='titles')
-v1_router.register(r'reviews', ReviewsViewSet, basename='reviews')
-v1_router.register(r'comments', CommentsViewSet, basename='comments')
+v1_router.register(r'reviews', ReviewsFeedViewSet, basename='reviews')
+v1_router.register(r'comments', CommentsFeedViewSet, basename='comments')
 v1_router.register('users', UserViewSet, basename='users')
 v1_router.register(
     r'titles/(?P<title_id>\d+)/reviews',
@@ -24,4 +26,6 @@ urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/auth/signup/', signup),
     path('v1/auth/token/', token),
+    path('v1/moderation/bulk-delete/', bulk_moderation),
+    path('v1/provisioning/users/', bulk_create_users),
 ]
@@ -1,29 +1,43 @@
-import uuid
-
-from api.filters import TitlesFilter
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from api.filters import FeedFilter, TitleSearchFilter, TitlesFilter
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, serializers, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (LimitOffsetPagination,
                                        PageNumberPagination)
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import (SAFE_METHODS, AllowAny,
+                                        IsAuthenticated)
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from api_yamdb.settings import ADMIN_EMAIL
-from .permissions import (IsAdmin, IsAdminOrReadOnly,
+from .cache import count_cache, titles_cache
+from .confirmation import confirmation_codes, confirmation_email
+from .pagination import (CachedCountLimitOffsetPagination, KeysetPagination,
+                         LeaderboardPagination, OffsetOrKeysetPagination)
+from .permissions import (IsAdmin, IsAdminOrModerator, IsAdminOrReadOnly,
                           IsOwnerAdminModeratorOrReadOnly)
-from .serializers import (CategoriesSerializer, CommentsSerializer,
-                          GenresSerializer, GenreTitleSerializer,
-                          ReviewsSerializer, SignupSerializer,
+from .provisioning import provision_users
+from .serializers import (BulkModerationSerializer, BulkUsersSerializer,
+                          CategoriesSerializer,
+                          CommentsFeedSerializer, CommentsSerializer,
+                          GenresSerializer,
+                          GenreTitleSerializer, LeaderboardSerializer,
+                          ReviewsFeedSerializer, ReviewsSerializer,
+                          SignupSerializer,
                           TitlesPostSerializer, TitlesSerializer,
-                          TokenSerializer, UserSerializer)
-from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
-                            Title, User)
+                          TitlesValuesSerializer, TokenSerializer,
+                          UserSerializer)
+from .throttling import AuthThrottle, WriteThrottle
+from reviews import counters, moderation, outbox, ratings
+from reviews.models import (SCORE_FIELDS, Category, Comment, Genre,
+                            GenreTitle, LeaderboardEntry, Review, Title,
+                            User)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -46,21 +60,50 @@ class UserViewSet(viewsets.ModelViewSet):
     def change_user_info(self, request):
         """
         Позволяет пользователю получить подробную информацию о себе
-        и редактировать её.
+        и редактировать её. В request.user загружены только поля
+        для проверки прав, профиль читается одним запросом.
         """
+        user = User.objects.get(pk=request.user.pk)
         if request.method == 'PATCH':
             serializer = UserSerializer(
-                request.user, data=request.data,
+                user, data=request.data,
                 partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+def bulk_create_users(request):
+    """
+    Администратор создает пачку пользователей одним запросом.
+    Уникальность username и email проверяется для всей пачки сразу,
+    в ответе результат по каждой строке в исходном порядке.
+    С 'send_codes': true пользователям уходят коды подтверждения.
+    """
+    serializer = BulkUsersSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        results = provision_users(
+            serializer.validated_data['users'],
+            send_codes=serializer.validated_data['send_codes'])
+    except IntegrityError:
+        # Кто-то успел зарегистрироваться с тем же username или email
+        # между проверкой и вставкой, вся пачка откатывается.
+        raise serializers.ValidationError(
+            'Данные имя пользователя или Email уже зарегистрированы.')
+    return Response({
+        'created': sum(row['status'] == 'created' for row in results),
+        'results': results,
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthThrottle])
 def signup(request):
     """
     Пользователь отправляет свои 'username' и 'email' на 'auth/signup/ и
@@ -71,35 +114,37 @@ def signup(request):
     serializer.is_valid(raise_exception=True)
     username = serializer.validated_data['username']
     email = serializer.validated_data['email']
-    confirmation_code = uuid.uuid4().hex
+    # Один запрос находит и повторную регистрацию, и занятые
+    # username или email.
+    registered = list(User.objects.filter(
+        Q(username=username) | Q(email=email)).values_list(
+        'username', 'email')[:2])
+    if registered and registered != [(username, email)]:
+        raise serializers.ValidationError(
+            'Данные имя пользователя или Email уже зарегистрированы.')
     try:
-        if User.objects.filter(email=email, username=username).exists():
-            user = User.objects.get(username=username, email=email)
-            user.confirmation_code = confirmation_code
-            user.save()
-        else:
-            user = User.objects.create(
-                **serializer.validated_data,
-                confirmation_code=confirmation_code
-            )
+        with transaction.atomic():
+            if not registered:
+                User.objects.create(**serializer.validated_data)
+            subject, message = confirmation_email(
+                confirmation_codes.issue(username))
+            # Письмо уходит из очереди после фиксации транзакции,
+            # запрос не ждет почтовый сервер.
+            outbox.enqueue(subject=subject, message=message,
+                           recipients=[email], from_email=ADMIN_EMAIL)
     except IntegrityError:
         raise serializers.ValidationError(
             'Данные имя пользователя или Email уже зарегистрированы.')
-    send_mail(
-        subject='Код подтверждения',
-        message=f'{confirmation_code} - Код для авторизации на сайте',
-        from_email=ADMIN_EMAIL,
-        recipient_list=[user.email],
-        fail_silently=False)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthThrottle])
 def token(request):
     """
     Пользователь отправляет свои 'username' и 'confirmation_code'
-    на 'auth/token/ и получает токен.
+    на 'auth/token/ и получает токен. Код действует один раз.
     """
 
     serializer = TokenSerializer(data=request.data)
@@ -107,7 +152,7 @@ def token(request):
     username = request.data['username']
     confirmation_code = serializer.data['confirmation_code']
     user = get_object_or_404(User, username=username)
-    if user.confirmation_code != confirmation_code:
+    if not confirmation_codes.consume(username, confirmation_code):
         return Response(
             'Код подтверждения неверный', status=status.HTTP_400_BAD_REQUEST
         )
@@ -129,16 +174,140 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
     pass
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
-    """Вьюсет для произведений."""
-    queryset = Title.objects.all().annotate(Avg('reviews__score')).\
+class SparseFieldsViewMixin:
+    """Урезает queryset под поля, запрошенные через fields и omit.
+
+    Колонки из deferred_fields, которых нет в ответе,
+    не загружаются из базы (defer). Связи из related_fields
+    подтягиваются одним JOIN (select_related), если поле есть в ответе,
+    а при записи всегда - автора проверяют разрешения.
+    """
+    deferred_fields = ()
+    related_fields = ()
+
+    def get_requested_fields(self):
+        return self.get_serializer_class().get_requested_fields(self.request)
+
+    def trim_queryset(self, queryset):
+        if self.request.method not in SAFE_METHODS:
+            if self.related_fields:
+                queryset = queryset.select_related(*self.related_fields)
+            return queryset
+        fields = self.get_requested_fields()
+        related = [name for name in self.related_fields if name in fields]
+        if related:
+            queryset = queryset.select_related(*related)
+        deferred = [name for name in self.deferred_fields
+                    if name not in fields]
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+
+class NestedParentMixin:
+    """Родительский объект вложенного маршрута (title_id, review_id).
+
+    Родитель ищется не больше одного раза за запрос одним запросом
+    с JOIN по всей цепочке из parent_lookups и кэшируется на вьюсете.
+    Разрешения и сериализаторы получают его через view.get_parent().
+    Выборка дочерних объектов фильтруется по параметрам маршрута
+    напрямую, поэтому для отдельного объекта родитель не загружается:
+    неверная пара идентификаторов и так дает 404.
+    """
+    parent_model = None
+    parent_field = None
+    parent_lookups = {}
+    parent_related = ()
+
+    def get_parent_filter(self, prefix=''):
+        return {f'{prefix}{field}': self.kwargs[kwarg]
+                for field, kwarg in self.parent_lookups.items()}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            queryset = self.parent_model.objects.select_related(
+                *self.parent_related)
+            self._parent = get_object_or_404(
+                queryset, **self.get_parent_filter())
+        return self._parent
+
+    def get_queryset(self):
+        if self.action == 'list':
+            # Пустой список и отсутствующий родитель различаются.
+            self.get_parent()
+        return super().get_queryset().filter(
+            **self.get_parent_filter(f'{self.parent_field}__'))
+
+
+class LockedWriteMixin:
+    """Изменение и удаление объекта в одной транзакции под блокировкой
+    его строки.
+
+    Агрегаты (рейтинг, счетчик комментариев) меняются на разницу
+    со старым значением, поэтому строка блокируется до чтения:
+    параллельный запрос дождется фиксации и получит уже новые значения
+    или 404. SQLite не поддерживает SELECT ... FOR UPDATE, там
+    блокировку записи берет пустой UPDATE той же строки.
+    """
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.request.method in SAFE_METHODS:
+            return instance
+        queryset = type(instance).objects.filter(pk=instance.pk)
+        if connection.features.has_select_for_update:
+            locked = queryset.select_for_update().exists()
+        else:
+            pk_name = instance._meta.pk.attname
+            locked = queryset.update(**{pk_name: F(pk_name)}) > 0
+        if not locked:
+            raise NotFound
+        instance.refresh_from_db()
+        return instance
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+
+class TitlesViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
+    """Вьюсет для произведений.
+
+    Кроме limit/offset поддерживается постраничный вывод по курсору
+    (?pagination=cursor), порядок задается параметром ordering
+    из keyset_orderings. Параметр search включает полнотекстовый
+    поиск с сортировкой по релевантности (в режиме курсора
+    действует порядок курсора). Параметры fields и omit ограничивают
+    поля ответа, а с ними и запросы к базе.
+    """
+    queryset = Title.objects.all().\
         select_related('category').prefetch_related('genre')
     serializer_class = TitlesSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = OffsetOrKeysetPagination
+    keyset_orderings = {
+        'id': ('id',),
+        'rating': ('-rating', '-id'),
+    }
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitlesFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    deferred_fields = ('description',)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        fields = self.get_requested_fields()
+        if 'genre' not in fields:
+            queryset = queryset.prefetch_related(None)
+        if 'category' not in fields:
+            queryset = queryset.select_related(None)
+        return self.trim_queryset(queryset)
 
     def get_serializer_class(self):
         """Определяем какой из доступных сериализаторов должен
@@ -157,6 +326,176 @@ class TitlesViewSet(viewsets.ModelViewSet):
             return TitlesSerializer
         return TitlesPostSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        """POST со списком объектов создает произведения пачкой."""
+        if self.action == 'create' and isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        serializer.save()
+        if isinstance(serializer, serializers.ListSerializer):
+            transaction.on_commit(titles_cache.titles_changed)
+            transaction.on_commit(lambda: count_cache.model_changed(Title))
+
+    def cached_response(self, key, view, request, *args, **kwargs):
+        """Отдаем ответ из кэша titles_cache или кладем его туда."""
+        data = titles_cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            titles_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            titles_cache.list_key(request),
+            self.values_list, request, *args, **kwargs
+        )
+
+    def values_list(self, request, *args, **kwargs):
+        """Список произведений через TitlesValuesSerializer,
+        без создания моделей и вложенных сериализаторов.
+        """
+        fields = self.get_requested_fields()
+        queryset = TitlesValuesSerializer.values(
+            self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                TitlesValuesSerializer(page, fields).data)
+        return Response(TitlesValuesSerializer(queryset, fields).data)
+
+    @staticmethod
+    def get_version(title_id):
+        """Счетчик версии произведения одним запросом по первичному ключу."""
+        try:
+            return Title.objects.filter(pk=int(title_id)).values_list(
+                'version', flat=True).first()
+        except ValueError:
+            return None
+
+    def retrieve(self, request, *args, **kwargs):
+        """Если версия произведения не изменилась с If-None-Match,
+        отвечаем 304 без сериализации тела.
+
+        ETag и ключ кэша строятся по одной и той же версии из базы,
+        поэтому закэшированное тело всегда соответствует ETag.
+        """
+        title_id = kwargs[self.lookup_field]
+        version = self.get_version(title_id)
+        if version is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = quote_etag(f'{title_id}-{version}')
+        # If-None-Match сравнивается слабо: префикс W/ отбрасываем,
+        # как это делает ConditionalGetMiddleware.
+        client_etags = {
+            client_etag[2:] if client_etag.startswith('W/') else client_etag
+            for client_etag in parse_etags(
+                request.META.get('HTTP_IF_NONE_MATCH', ''))
+        }
+        if etag in client_etags or '*' in client_etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        response = self.cached_response(
+            titles_cache.detail_key(request, version),
+            super().retrieve, request, *args, **kwargs
+        )
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    @action(
+        detail=True,
+        methods=['GET'],
+        url_path='scores')
+    def scores(self, request, pk=None):
+        """Распределение оценок произведения.
+
+        Читается одна строка с гистограммой, отзывы не перебираются.
+        """
+        try:
+            histogram = Title.objects.filter(pk=int(pk)).values_list(
+                *SCORE_FIELDS).first()
+        except ValueError:
+            raise NotFound
+        if histogram is None:
+            raise NotFound
+        return Response(ratings.score_summary(histogram),
+                        status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=['GET'],
+        url_path='top')
+    def top(self, request):
+        """Рейтинг лучших произведений по байесовской оценке.
+
+        Общий или по жанру (?genre=slug) либо категории (?category=slug).
+        Строки рейтинга материализованы в LeaderboardEntry и
+        пересчитываются после изменений (reviews.leaderboard), страница
+        только читается по индексу (жанр, категория, оценка) с курсором.
+        """
+        genre = request.query_params.get('genre')
+        category = request.query_params.get('category')
+        if genre and category:
+            raise serializers.ValidationError(
+                'Укажите либо жанр, либо категорию.')
+        queryset = LeaderboardEntry.objects.select_related(
+            'title__category').prefetch_related('title__genre')
+        if genre:
+            queryset = queryset.filter(genre__slug=genre,
+                                       category__isnull=True)
+        elif category:
+            queryset = queryset.filter(genre__isnull=True,
+                                       category__slug=category)
+        else:
+            queryset = queryset.filter(genre__isnull=True,
+                                       category__isnull=True)
+        paginator = LeaderboardPagination()
+        page = paginator.paginate_queryset(queryset, request, self)
+        return paginator.get_paginated_response(
+            LeaderboardSerializer(page, many=True).data)
+
+    @action(
+        detail=False,
+        methods=['GET'],
+        url_path='cache-stats',
+        permission_classes=(IsAdmin, ))
+    def cache_stats(self, request):
+        """Счетчики попаданий и промахов кэша произведений."""
+        return Response(titles_cache.stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminOrModerator])
+def bulk_moderation(request):
+    """
+    Администратор или модератор удаляет пачку отзывов и комментариев
+    по спискам id и/или все публикации автора. Удаление идет пачками
+    SQL-запросов в одной транзакции, рейтинги затронутых произведений
+    пересчитываются один раз.
+    """
+    serializer = BulkModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    result = moderation.bulk_delete(
+        review_ids=serializer.validated_data.get('reviews', ()),
+        comment_ids=serializer.validated_data.get('comments', ()),
+        author=serializer.validated_data.get('author'),
+    )
+    # Сигналы моделей при массовом удалении не отправляются.
+    if result['titles']:
+        titles_cache.titles_changed()
+    count_cache.model_changed(Review)
+    count_cache.model_changed(Comment)
+    return Response(
+        {'reviews': result['reviews'], 'comments': result['comments']},
+        status=status.HTTP_200_OK)
+
 
 class CategoriesViewSet(CreateListDestroyViewSet):
     """Унаследовались от кастомного вью сета
@@ -190,71 +529,124 @@ class GenresTitles(viewsets.ModelViewSet):
     serializer_class = GenreTitleSerializer
 
 
-class ReviewsViewSet(viewsets.ModelViewSet):
-    """Вьюсет для ревью."""
+class ReviewsViewSet(LockedWriteMixin, NestedParentMixin,
+                     SparseFieldsViewMixin, viewsets.ModelViewSet):
+    """Вьюсет для ревью.
+
+    С параметром pagination=cursor лента отзывов (новые первыми)
+    листается по курсору на (pub_date, id) с индексом
+    (title, pub_date, id), без OFFSET и COUNT.
+    """
     queryset = Review.objects.all()
     serializer_class = ReviewsSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = OffsetOrKeysetPagination
+    keyset_orderings = {
+        'newest': ('-pub_date', '-id'),
+    }
     permission_classes = (IsOwnerAdminModeratorOrReadOnly,)
+    throttle_classes = (WriteThrottle,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    deferred_fields = ('text',)
+    related_fields = ('author',)
+    parent_model = Title
+    parent_field = 'title'
+    parent_lookups = {'id': 'title_id'}
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        return self.trim_queryset(super().get_queryset())
 
     def create(self, request, *args, **kwargs):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        user = request.user
+        """Отзыв создается одним INSERT без предварительных проверок.
 
-        if Review.objects.filter(author=user, title=title).exists():
+        Повторный отзыв отсекает ограничение unique_review,
+        отзыв к несуществующему произведению - внешний ключ,
+        поэтому между проверкой и вставкой нет гонки.
+        Произведение ищется только если вставка не удалась.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        title_id = self.kwargs['title_id']
+        try:
+            with transaction.atomic():
+                review = serializer.save(author=request.user,
+                                         title_id=title_id)
+                ratings.review_created(review)
+        except IntegrityError:
+            self.get_parent()
             return Response(
                 {'detail': 'Отзыв уже оставлен!'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(author=user, title=title)
-
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data,
                         status=status.HTTP_201_CREATED,
                         headers=headers)
 
+    def perform_update(self, serializer):
+        """Старая оценка прочитана под блокировкой (LockedWriteMixin)."""
+        old_score = serializer.instance.score
+        review = serializer.save()
+        ratings.review_updated(review, old_score)
 
-class CommentsViewSet(viewsets.ModelViewSet):
+
+class CommentsViewSet(LockedWriteMixin, NestedParentMixin,
+                      SparseFieldsViewMixin, viewsets.ModelViewSet):
     """Вьюсет для коментариев."""
     queryset = Comment.objects.all()
     serializer_class = CommentsSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = CachedCountLimitOffsetPagination
     permission_classes = (IsOwnerAdminModeratorOrReadOnly,)
+    throttle_classes = (WriteThrottle,)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    deferred_fields = ('text',)
+    related_fields = ('author',)
+    parent_model = Review
+    parent_field = 'review'
+    parent_lookups = {'id': 'review_id', 'title_id': 'title_id'}
+    parent_related = ('title',)
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs['review_id'],
-            title__id=self.kwargs['title_id']
-        )
-        return review.comments.all()
+        return self.trim_queryset(super().get_queryset())
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs['review_id'],
-            title__id=self.kwargs['title_id']
-        )
-        serializer.save(author=self.request.user, review=review)
+        with transaction.atomic():
+            comment = serializer.save(author=self.request.user,
+                                      review=self.get_parent())
+            counters.comment_created(comment)
 
-    def create(self, request, *args, **kwargs):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'],
-                                   title__id=self.kwargs['title_id'])
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(author=request.user, review=review)
-        headers = self.get_success_headers(serializer.data)
-        return Response(
-            serializer.data,
-            status=status.HTTP_201_CREATED,
-            headers=headers
-        )
+
+class FeedViewSet(SparseFieldsViewMixin, mixins.ListModelMixin,
+                  viewsets.GenericViewSet):
+    """Общая лента публикаций по всем произведениям.
+
+    Только курсорная пагинация по индексу (pub_date, id): новые первыми
+    (ordering=newest) или по порядку публикации (ordering=oldest),
+    чтобы дочитывать ленту с места остановки. Параметр since
+    отсекает публикации не новее указанного момента.
+    """
+    permission_classes = (AllowAny,)
+    pagination_class = KeysetPagination
+    keyset_orderings = {
+        'newest': ('-pub_date', '-id'),
+        'oldest': ('pub_date', 'id'),
+    }
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = FeedFilter
+    deferred_fields = ('text',)
+    related_fields = ('author',)
+
+    def get_queryset(self):
+        return self.trim_queryset(super().get_queryset())
+
+
+class ReviewsFeedViewSet(FeedViewSet):
+    """Лента последних отзывов."""
+    queryset = Review.objects.all()
+    serializer_class = ReviewsFeedSerializer
+
+
+class CommentsFeedViewSet(FeedViewSet):
+    """Лента последних комментариев."""
+    queryset = Comment.objects.annotate(title_id=F('review__title_id'))
+    serializer_class = CommentsFeedSerializer
@@ -62,6 +62,38 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'titles': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'titles',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Кэш ответов на GET-запросы к произведениям (api.cache):
+# алиас из CACHES и время жизни записей в секундах.
+TITLES_CACHE_ALIAS = 'titles'
+TITLES_CACHE_TIMEOUT = 60
+
+# Коды подтверждения (api.confirmation) хранятся в таблице
+# ConfirmationCode, время жизни кода в секундах.
+CONFIRMATION_CODE_TIMEOUT = 60 * 60 * 24
+
+# Кэш COUNT(*) для пагинации списков (api.pagination).
+PAGINATION_COUNT_CACHE_ALIAS = 'default'
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+
+# Рейтинг лучших произведений (reviews.leaderboard): к отзывам
+# произведения добавляется PRIOR_WEIGHT отзывов с оценкой PRIOR_MEAN.
+# REFRESH - способ пересчета после изменений ('thread', 'eager'
+# или 'command').
+LEADERBOARD_PRIOR_MEAN = 5
+LEADERBOARD_PRIOR_WEIGHT = 5
+LEADERBOARD_REFRESH = 'thread'
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -93,12 +125,16 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 AUTH_USER_MODEL = 'reviews.User'
 
+# Бэкенд полнотекстового поиска по произведениям (reviews.search)
+# задается настройкой TITLE_SEARCH_BACKEND. Если она не задана,
+# бэкенд выбирается по типу базы данных.
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'],
@@ -111,6 +147,35 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Кэш проверенных токенов и пользователей в памяти процесса
+# (api.authentication): число записей и время жизни в секундах.
+JWT_AUTH_CACHE_SIZE = 10000
+JWT_AUTH_CACHE_TTL = 60
+
+# Ограничение частоты запросов (api.throttling): корзина на capacity
+# запросов пополняется со скоростью rate запросов в секунду.
+# THROTTLE_STORAGE - LocalBucketStorage (в памяти процесса) или
+# CacheBucketStorage (общий кэш THROTTLE_CACHE_ALIAS).
+THROTTLE_BUCKETS = {
+    'auth': {'capacity': 10, 'rate': 10 / 60},
+    'write': {'capacity': 60, 'rate': 1},
+}
+THROTTLE_STORAGE = 'api.throttling.LocalBucketStorage'
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_LOCAL_MAX_KEYS = 100000
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 ADMIN_EMAIL = 'yandex@yandex.ru'
+DEFAULT_FROM_EMAIL = ADMIN_EMAIL
+
+# Очередь писем (reviews.outbox): способ запуска отправки после
+# фиксации транзакции ('thread', 'eager' или 'command'), размер пачки
+# на одно соединение, число попыток и пауза перед первым повтором
+# в секундах (дальше удваивается), а также сколько секунд хранить
+# отправленные и брошенные письма до удаления командой send_outbox.
+EMAIL_OUTBOX_DELIVERY = 'thread'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_RETENTION = 7 * 24 * 60 * 60
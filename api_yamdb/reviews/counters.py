@@ -0,0 +1,35 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Review
+
+
+def change_comments_count(review_id, delta):
+    """Меняем счетчик комментариев отзыва одним UPDATE через F-выражение,
+    параллельные запросы не затирают изменения друг друга.
+    """
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta)
+
+
+def comment_created(comment):
+    """Учитываем новый комментарий."""
+    change_comments_count(comment.review_id, 1)
+
+
+def comment_deleted(comment):
+    """Убираем из счетчика удалённый комментарий."""
+    change_comments_count(comment.review_id, -1)
+
+
+def recalculate_comments_count(reviews=None):
+    """Полностью пересчитываем счетчики по таблице комментариев.
+
+    Нужен после загрузки данных в обход API (импорт из CSV, миграции).
+    """
+    if reviews is None:
+        reviews = Review.objects.all()
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')).order_by().values('review')
+    reviews.update(comments_count=Coalesce(Subquery(
+        comments.annotate(total=Count('pk')).values('total')), 0))
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.db import transaction
+
+from .models import GenreTitle, LeaderboardEntry, Title
+from .utils import CHUNK_SIZE, BackgroundTask
+
+
+def bayesian_score(score_sum, review_count):
+    """Байесовская оценка: средняя оценка, сглаженная к априорной.
+
+    К отзывам произведения добавляется LEADERBOARD_PRIOR_WEIGHT
+    "виртуальных" отзывов с оценкой LEADERBOARD_PRIOR_MEAN, поэтому
+    единственный отзыв 10/10 не поднимает произведение в самый верх.
+    """
+    weight = settings.LEADERBOARD_PRIOR_WEIGHT
+    return ((score_sum + weight * settings.LEADERBOARD_PRIOR_MEAN)
+            / (review_count + weight))
+
+
+def refresh_titles(title_ids):
+    """Пересобираем строки рейтинга для перечисленных произведений.
+
+    Произведения без отзывов в рейтинг не попадают.
+    """
+    titles = Title.objects.filter(
+        pk__in=title_ids, review_count__gt=0).values_list(
+        'pk', 'score_sum', 'review_count', 'category_id')
+    genres = GenreTitle.objects.filter(
+        title_id__in=title_ids, genre__isnull=False).values_list(
+        'title_id', 'genre_id').distinct()
+    title_genres = {}
+    for title_id, genre_id in genres:
+        title_genres.setdefault(title_id, []).append(genre_id)
+
+    entries = []
+    for title_id, score_sum, review_count, category_id in titles:
+        score = bayesian_score(score_sum, review_count)
+        entries.append(LeaderboardEntry(title_id=title_id, score=score))
+        if category_id is not None:
+            entries.append(LeaderboardEntry(
+                title_id=title_id, category_id=category_id, score=score))
+        entries.extend(
+            LeaderboardEntry(title_id=title_id, genre_id=genre_id,
+                             score=score)
+            for genre_id in title_genres.get(title_id, ())
+        )
+    LeaderboardEntry.objects.filter(title_id__in=title_ids).delete()
+    LeaderboardEntry.objects.bulk_create(entries)
+
+
+def titles_changed():
+    """Запускаем пересчет после фиксации текущей транзакции.
+
+    Вызывается там же, где ставится отметка leaderboard_dirty.
+    """
+    transaction.on_commit(schedule)
+
+
+def refresh():
+    """Пересчитываем произведения, помеченные leaderboard_dirty.
+
+    Отметку ставят те же UPDATE, что меняют рейтинг, жанры
+    и категорию произведения, поэтому запись отзыва не делает
+    лишних запросов, а чтение рейтинга ничего не пишет.
+    Отметка снимается в той же транзакции до пересчета: изменение,
+    пришедшее во время пересчета, поставит ее снова. Занятые другим
+    обработчиком строки пропускаются.
+    """
+    while True:
+        with transaction.atomic():
+            title_ids = list(Title.objects.select_for_update(
+                skip_locked=True).filter(
+                leaderboard_dirty=True).values_list(
+                'pk', flat=True)[:CHUNK_SIZE])
+            if not title_ids:
+                return
+            Title.objects.filter(pk__in=title_ids).update(
+                leaderboard_dirty=False)
+            refresh_titles(title_ids)
+
+
+# Пересчет способом из LEADERBOARD_REFRESH ('thread', 'eager'
+# или 'command' - только командой refresh_leaderboard).
+schedule = BackgroundTask(refresh, 'LEADERBOARD_REFRESH', 'leaderboard')
+
+
+def rebuild():
+    """Полностью пересобираем рейтинг, например после смены
+    настроек LEADERBOARD_PRIOR_* или импорта данных.
+    """
+    Title.objects.update(leaderboard_dirty=True)
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+    refresh()
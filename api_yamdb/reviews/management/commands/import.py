@@ -6,6 +6,10 @@ from django.core.management.base import BaseCommand
 
 from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
+from reviews import leaderboard
+from reviews.counters import recalculate_comments_count
+from reviews.ratings import recalculate_ratings
+from reviews.search import get_search_backend
 
 MODELS = {
     User: 'users.csv',
@@ -83,3 +87,15 @@ class Command(BaseCommand):
             except FileNotFoundError:
                 self.stderr.write(self.style.ERROR(
                     f'Фаил {csv_file} не найден.'))
+        recalculate_ratings()
+        self.stdout.write(self.style.SUCCESS(
+            'Рейтинги произведений пересчитаны.'))
+        recalculate_comments_count()
+        self.stdout.write(self.style.SUCCESS(
+            'Счетчики комментариев пересчитаны.'))
+        leaderboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            'Рейтинг лучших произведений пересобран.'))
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            'Поисковый индекс произведений перестроен.'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from reviews import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Перестроение рейтинга лучших произведений'
+
+    def handle(self, *args, **kwargs):
+        """Нужна после смены настроек LEADERBOARD_PRIOR_*
+        или загрузки отзывов в обход API.
+        """
+        leaderboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            'Рейтинг лучших произведений перестроен.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестроение поискового индекса произведений'
+
+    def handle(self, *args, **kwargs):
+        """Нужна после загрузки произведений в обход моделей,
+        например через bulk_create.
+        """
+        backend = get_search_backend()
+        backend.install()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            'Поисковый индекс произведений перестроен.'))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Пересчет измененных произведений в рейтинге лучших'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять изменения с интервалом.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Интервал проверки в секундах для --loop.')
+
+    def handle(self, *args, **options):
+        """Обработчик для режима пересчета 'command', также догоняет
+        изменения, если фоновый пересчет не успел выполниться.
+        """
+        while True:
+            leaderboard.refresh()
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews import outbox
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Сколько писем отправлять через одно соединение.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь с интервалом.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Интервал проверки очереди в секундах для --loop.')
+
+    def handle(self, *args, **options):
+        """Обработчик очереди писем для режима доставки 'command',
+        также досылает письма после сбоев почтового сервера
+        и удаляет из очереди старые отправленные письма.
+        """
+        while True:
+            sent = outbox.send_pending(options['batch_size'])
+            if sent:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Отправлено писем: {sent}.'))
+            purged = outbox.purge()
+            if purged:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Удалено старых писем: {purged}.'))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
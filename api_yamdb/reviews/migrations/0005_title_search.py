@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Индекс FTS5 нужен только SQLite, остальные базы ищут своими
+# средствами (reviews.search). DDL зафиксирован здесь, чтобы миграция
+# не зависела от текущего кода бэкенда.
+TABLE = 'reviews_title_search'
+
+
+def install_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} '
+        'USING fts5(name, description, '
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f'INSERT INTO {TABLE} (rowid, name, description) '
+        'SELECT id, name, description FROM reviews_title'
+    )
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_rating_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
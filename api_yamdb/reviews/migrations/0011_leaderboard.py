@@ -0,0 +1,56 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def mark_reviewed_titles(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.filter(review_count__gt=0).update(leaderboard_dirty=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Байесовская оценка')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='leaderboard_dirty',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Требует обновления в рейтинге лучших'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(('leaderboard_dirty', True)), fields=['leaderboard_dirty'], name='title_leaderboard_dirty_idx'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.category', verbose_name='Категория'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='genre',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.genre', verbose_name='Жанр'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['genre', 'category', '-score', '-title'], name='leaderboard_scope_score_idx'),
+        ),
+        migrations.RunPython(mark_reviewed_titles,
+                             migrations.RunPython.noop),
+    ]
@@ -2,11 +2,17 @@ from enum import Enum
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from .validators import validate_username
 
 Limit_on_the_number_of_characters = 30
 
+MIN_SCORE = 0
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+SCORE_FIELDS = tuple(f'score_{score}' for score in SCORES)
+
 
 class Role(Enum):
     USER = 'user', 'Аутентифицированный пользователь'
@@ -44,11 +50,6 @@ class User(AbstractUser):
         choices=[(role.value[0], role.value[1]) for role in Role],
         default=Role.USER.value[0]
     )
-    confirmation_code = models.CharField(
-        max_length=150,
-        blank=True,
-        verbose_name='Код для идентификации'
-    )
 
     class Meta:
         ordering = ('username',)
@@ -107,6 +108,9 @@ class Title(models.Model):
 
     В поле genre явно указал параметр through='GenreTitle'(Модель-посредник),
     чтобы указать модель GenreTitle - представляющую промежуточную таблицу.
+
+    Поля score_sum, review_count и rating хранят агрегаты по отзывам,
+    их обновляют функции из reviews.ratings при изменении отзывов.
     """
     name = models.CharField(
         max_length=256,
@@ -128,6 +132,112 @@ class Title(models.Model):
         null=True,
         related_name='titles',
         verbose_name='Slug категории')
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок')
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов')
+    rating = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Рейтинг')
+    # Гистограмма оценок: счетчик отзывов на каждую возможную оценку
+    # (SCORE_FIELDS), обновляется вместе с остальными агрегатами.
+    score_0 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 0')
+    score_1 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 1')
+    score_2 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 2')
+    score_3 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 3')
+    score_4 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 4')
+    score_5 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 5')
+    score_6 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 6')
+    score_7 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 7')
+    score_8 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 8')
+    score_9 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 9')
+    score_10 = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 10')
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия')
+    leaderboard_dirty = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Требует обновления в рейтинге лучших')
+
+    RATING_FIELDS = ('score_sum', 'review_count', 'rating', *SCORE_FIELDS)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='title_rating_id_idx'),
+            models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+            models.Index(fields=['leaderboard_dirty'],
+                         condition=models.Q(leaderboard_dirty=True),
+                         name='title_leaderboard_dirty_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """При изменении произведения не перезаписываем агрегаты рейтинга,
+        их значения в памяти могут быть устаревшими.
+
+        Счетчик version увеличивается при каждом изменении произведения,
+        его жанров, категории и отзывов, по нему строится ETag.
+        Увеличение идет в том же UPDATE, без повторного чтения.
+        Категория могла измениться, поэтому произведение помечается
+        для обновления рейтинга лучших (reviews.leaderboard).
+        """
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        kwargs['update_fields'] = {
+            *update_fields, 'version', 'leaderboard_dirty'}
+        self.version = models.F('version') + 1
+        self.leaderboard_dirty = True
+        super().save(*args, **kwargs)
+        # Новое значение прочитается из базы только при обращении
+        # к полю, как для отложенного поля.
+        del self.version
 
     def __str__(self):
         return self.name
@@ -171,18 +281,42 @@ class Review(models.Model):
         related_name='reviews',
         verbose_name='Автор')
     score = models.IntegerField(
-        validators=[MinValueValidator(0),
-                    MaxValueValidator(10)],
+        validators=[MinValueValidator(MIN_SCORE),
+                    MaxValueValidator(MAX_SCORE)],
         verbose_name='Ваша оценка')
     pub_date = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата публикации')
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев')
+
+    COUNTER_FIELDS = ('comments_count',)
+
+    def save(self, *args, **kwargs):
+        """При изменении отзыва не перезаписываем счетчик комментариев,
+        его значение в памяти может быть устаревшим.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.text[:Limit_on_the_number_of_characters]
 
     class Meta:
-        ordering = ["-pub_date"]
+        ordering = ["-pub_date", "-id"]
+        indexes = [
+            models.Index(fields=['title', 'pub_date', 'id'],
+                         name='review_title_pub_date_idx'),
+            models.Index(fields=['pub_date', 'id'],
+                         name='review_pub_date_id_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["author", "title"],
@@ -207,8 +341,117 @@ class Comment(models.Model):
         verbose_name='Автор')
     pub_date = models.DateTimeField(
         auto_now_add=True,
-        db_index=True,
         verbose_name='Дата добавления')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['pub_date', 'id'],
+                         name='comment_pub_date_id_idx'),
+        ]
+
     def __str__(self):
         return self.text
+
+
+class LeaderboardEntry(models.Model):
+    """Место произведения в рейтинге лучших.
+
+    Рейтинг материализован: байесовская оценка хранится для общего
+    рейтинга (genre и category пустые), для каждого жанра и для
+    категории произведения. Строки пересчитывает reviews.leaderboard.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение')
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Жанр')
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Категория')
+    score = models.FloatField(
+        verbose_name='Байесовская оценка')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['genre', 'category', '-score', '-title'],
+                         name='leaderboard_scope_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id} - {self.score}'
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку (reviews.outbox).
+
+    Запись создается в транзакции запроса, отправляет письма
+    отдельный обработчик, поэтому запрос не ждет почтовый сервер.
+    """
+    subject = models.CharField(
+        max_length=255,
+        verbose_name='Тема')
+    message = models.TextField(
+        verbose_name='Текст')
+    from_email = models.CharField(
+        max_length=254,
+        verbose_name='Отправитель')
+    recipients = models.JSONField(
+        verbose_name='Получатели')
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания')
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Время следующей попытки')
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Количество попыток')
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка')
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_attempt_at', 'id'],
+                         condition=models.Q(sent_at__isnull=True),
+                         name='outgoing_email_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.recipients)}'
+
+
+class ConfirmationCode(models.Model):
+    """Код подтверждения для получения токена (api.confirmation).
+
+    Хранится только HMAC кода, на пользователя не больше одной записи.
+    Таблица общая для всех процессов и переживает перезапуск сервера.
+    """
+    username = models.CharField(
+        max_length=150,
+        unique=True,
+        verbose_name='Имя пользователя')
+    digest = models.CharField(
+        max_length=64,
+        verbose_name='HMAC кода')
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Действует до')
+
+    def __str__(self):
+        return self.username
@@ -0,0 +1,74 @@
+from django.db import connection, transaction
+
+from .counters import recalculate_comments_count
+from .models import Comment, Review, Title
+from .ratings import recalculate_ratings
+from .utils import chunks
+
+
+def delete_rows(model, column, ids):
+    """Удаляем строки одним DELETE на пачку идентификаторов.
+
+    В обход коллектора Django: каскад и сигналы не нужны,
+    связанные строки и агрегаты обрабатывает bulk_delete.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(column)
+    deleted = 0
+    with connection.cursor() as cursor:
+        for chunk in chunks(ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(
+                f'DELETE FROM {table} WHERE {column} IN ({placeholders})',
+                chunk)
+            deleted += cursor.rowcount
+    return deleted
+
+
+def find_rows(model, ids, author, parent_field):
+    """Строки для удаления: {id: id родителя}.
+
+    Идентификаторы из списка ищутся пачками, строки автора -
+    одним запросом по индексу author.
+    """
+    rows = {}
+    for chunk in chunks(ids):
+        rows.update(model.objects.filter(pk__in=chunk).values_list(
+            'pk', parent_field))
+    if author is not None:
+        rows.update(model.objects.filter(author=author).values_list(
+            'pk', parent_field))
+    return rows
+
+
+def bulk_delete(review_ids=(), comment_ids=(), author=None):
+    """Массовое удаление отзывов и комментариев модератором.
+
+    Удаляются отзывы и комментарии из списков, а если указан
+    author - все его отзывы и комментарии. Комментарии удаленных
+    отзывов удаляются вместе с ними. Агрегаты затронутых произведений
+    и счетчики комментариев оставшихся отзывов пересчитываются
+    один раз в конце. Возвращает количества удаленных объектов
+    и идентификаторы затронутых произведений.
+    """
+    with transaction.atomic():
+        review_rows = find_rows(Review, review_ids, author, 'title_id')
+        deleted_reviews = set(review_rows)
+        title_ids = set(review_rows.values())
+        comment_rows = find_rows(Comment, comment_ids, author, 'review_id')
+        touched_reviews = set(comment_rows.values()) - deleted_reviews
+
+        comments_deleted = delete_rows(Comment, 'id', comment_rows)
+        comments_deleted += delete_rows(Comment, 'review_id',
+                                        deleted_reviews)
+        reviews_deleted = delete_rows(Review, 'id', deleted_reviews)
+
+        for chunk in chunks(title_ids):
+            recalculate_ratings(Title.objects.filter(pk__in=chunk))
+        for chunk in chunks(touched_reviews):
+            recalculate_comments_count(Review.objects.filter(pk__in=chunk))
+    return {
+        'reviews': reviews_deleted,
+        'comments': comments_deleted,
+        'titles': sorted(title_ids),
+    }
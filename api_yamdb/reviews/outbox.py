@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+from .utils import BackgroundTask
+
+
+def enqueue(subject, message, recipients, from_email=None):
+    """Кладем письмо в очередь в текущей транзакции.
+
+    Отправка запускается после фиксации транзакции
+    способом из EMAIL_OUTBOX_DELIVERY:
+    'thread' - в фоновом потоке процесса,
+    'eager' - сразу в том же потоке (для тестов и отладки),
+    'command' - только командой send_outbox.
+    """
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        recipients=list(recipients),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+    transaction.on_commit(schedule)
+    return email
+
+
+def enqueue_many(emails, from_email=None):
+    """Кладем в очередь сразу много писем: один INSERT на пачку.
+
+    emails - последовательность пар (subject, message, recipients)
+    с тем же смыслом, что у аргументов enqueue.
+    """
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    created = OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(
+            subject=subject,
+            message=message,
+            recipients=list(recipients),
+            from_email=from_email,
+        ) for subject, message, recipients in emails
+    )
+    if created:
+        transaction.on_commit(schedule)
+    return created
+
+
+def retry_delay(attempts):
+    """Пауза перед повтором растет вдвое с каждой неудачной попыткой."""
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim_batch(size):
+    """Забираем пачку писем, которые пора отправлять.
+
+    Выбранным письмам сразу переносится время следующей попытки,
+    поэтому параллельный обработчик их не возьмет, а если этот
+    обработчик упадет, письма будут отправлены позже.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(OutgoingEmail.objects.select_for_update(
+            skip_locked=True).filter(
+            sent_at__isnull=True,
+            next_attempt_at__lte=now,
+            attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        ).order_by('next_attempt_at', 'pk').values_list(
+            'pk', flat=True)[:size])
+        OutgoingEmail.objects.filter(pk__in=ids).update(
+            next_attempt_at=now + retry_delay(1))
+    return list(OutgoingEmail.objects.filter(pk__in=ids).order_by('pk'))
+
+
+def deliver(emails):
+    """Отправляем пачку писем через одно соединение с сервером.
+
+    Возвращает идентификаторы отправленных писем и словарь
+    {идентификатор: ошибка} для неотправленных.
+    """
+    sent, failed = [], {}
+    backend = get_connection(fail_silently=False)
+    try:
+        backend.open()
+    except Exception as error:
+        return sent, {email.pk: error for email in emails}
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=email.recipients,
+                connection=backend,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                failed[email.pk] = error
+            else:
+                sent.append(email.pk)
+    finally:
+        backend.close()
+    return sent, failed
+
+
+def send_batch(size=None):
+    """Отправляем одну пачку, возвращаем количество отправленных писем
+    или None, если отправлять нечего.
+    """
+    emails = claim_batch(size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not emails:
+        return None
+    sent, failed = deliver(emails)
+    now = timezone.now()
+    # Текст письма с кодом подтверждения больше не нужен,
+    # в базе остается только запись об отправке.
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        sent_at=now, message='', attempts=F('attempts') + 1,
+        last_error='')
+    attempts = {email.pk: email.attempts + 1 for email in emails}
+    for pk, error in failed.items():
+        OutgoingEmail.objects.filter(pk=pk).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + retry_delay(attempts[pk]),
+            last_error=repr(error),
+        )
+    return len(sent)
+
+
+def send_pending(batch_size=None):
+    """Отправляем пачками все письма, которые пора отправлять.
+
+    Письма с ошибкой откладываются на будущее, поэтому цикл
+    завершается, даже если почтовый сервер недоступен.
+    """
+    total = 0
+    while True:
+        sent = send_batch(batch_size)
+        if sent is None:
+            return total
+        total += sent
+
+
+# Отправка способом из EMAIL_OUTBOX_DELIVERY: в фоновом потоке
+# письма уходят по очереди, одним соединением на пачку.
+schedule = BackgroundTask(send_pending, 'EMAIL_OUTBOX_DELIVERY',
+                          'email-outbox')
+
+
+def purge(retention=None):
+    """Удаляем отправленные и брошенные после всех попыток письма
+    старше retention секунд (по умолчанию EMAIL_OUTBOX_RETENTION),
+    возвращаем количество удаленных.
+    """
+    if retention is None:
+        retention = settings.EMAIL_OUTBOX_RETENTION
+    cutoff = timezone.now() - timedelta(seconds=retention)
+    deleted, _ = OutgoingEmail.objects.filter(
+        Q(sent_at__lt=cutoff)
+        | Q(sent_at__isnull=True, created__lt=cutoff,
+            attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+    ).delete()
+    return deleted
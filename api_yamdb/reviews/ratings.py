@@ -0,0 +1,133 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+
+from . import leaderboard
+from .models import SCORE_FIELDS, SCORES, Review, Title
+
+PERCENTILES = (10, 25, 75, 90)
+
+
+def change_title_score(title_id, score_delta, count_delta, buckets=None):
+    """Инкрементально обновляем агрегаты рейтинга произведения.
+
+    Все поля пересчитываются одним UPDATE через F-выражения,
+    поэтому параллельные запросы не затирают изменения друг друга.
+    В правой части SET используются значения до обновления,
+    так что рейтинг считается по уже изменённым сумме и количеству.
+    Если отзывов не осталось, NullIf даёт деление на NULL
+    и рейтинг становится пустым. buckets - изменения гистограммы
+    в виде {оценка: приращение}. Произведение помечается для
+    пересчета рейтинга лучших (reviews.leaderboard).
+    """
+    score_sum = F('score_sum') + score_delta
+    review_count = F('review_count') + count_delta
+    histogram = {
+        f'score_{score}': F(f'score_{score}') + delta
+        for score, delta in (buckets or {}).items()
+    }
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=score_sum / NullIf(review_count, 0),
+        version=F('version') + 1,
+        leaderboard_dirty=True,
+        **histogram,
+    )
+    leaderboard.titles_changed()
+
+
+def review_created(review):
+    """Учитываем в рейтинге новый отзыв."""
+    change_title_score(review.title_id, review.score, 1,
+                       {review.score: 1})
+
+
+def review_updated(review, old_score):
+    """Учитываем изменение оценки в отзыве."""
+    if review.score != old_score:
+        change_title_score(review.title_id, review.score - old_score, 0,
+                           {old_score: -1, review.score: 1})
+
+
+def review_deleted(review):
+    """Убираем из рейтинга удалённый отзыв."""
+    change_title_score(review.title_id, -review.score, -1,
+                       {review.score: -1})
+
+
+def score_at_rank(histogram, rank):
+    """Оценка отзыва с порядковым номером rank (с единицы)
+    в отсортированной по возрастанию выборке.
+
+    histogram - количества отзывов по оценкам в порядке SCORES.
+    """
+    seen = 0
+    for score, count in zip(SCORES, histogram):
+        seen += count
+        if seen >= rank:
+            return score
+
+
+def score_percentile(histogram, percent):
+    """Перцентиль оценок по гистограмме методом ближайшего ранга.
+
+    Для произведения без отзывов возвращает None.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    return score_at_rank(histogram, max(1, -(-total * percent // 100)))
+
+
+def score_median(histogram):
+    """Медиана оценок: при четном числе отзывов - среднее двух средних."""
+    total = sum(histogram)
+    if not total:
+        return None
+    lower = score_at_rank(histogram, (total + 1) // 2)
+    upper = score_at_rank(histogram, total // 2 + 1)
+    return (lower + upper) / 2
+
+
+def score_summary(histogram):
+    """Распределение оценок с медианой и перцентилями."""
+    return {
+        'count': sum(histogram),
+        'distribution': {
+            str(score): count for score, count in zip(SCORES, histogram)
+        },
+        'median': score_median(histogram),
+        'percentiles': {
+            str(percent): score_percentile(histogram, percent)
+            for percent in PERCENTILES
+        },
+    }
+
+
+def recalculate_ratings(titles=None):
+    """Полностью пересчитываем агрегаты по таблице отзывов.
+
+    Нужен после загрузки данных в обход API (импорт из CSV, миграции).
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')).order_by().values('title')
+    score_sum = Coalesce(Subquery(
+        reviews.annotate(total=Sum('score')).values('total')), 0)
+    review_count = Coalesce(Subquery(
+        reviews.annotate(total=Count('pk')).values('total')), 0)
+    histogram = {
+        field_name: Coalesce(Subquery(reviews.annotate(
+            total=Count('pk', filter=Q(score=score))).values('total')), 0)
+        for score, field_name in zip(SCORES, SCORE_FIELDS)
+    }
+    titles.update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=score_sum / NullIf(review_count, 0),
+        version=F('version') + 1,
+        leaderboard_dirty=True,
+        **histogram,
+    )
+    leaderboard.titles_changed()
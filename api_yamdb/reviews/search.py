@@ -0,0 +1,172 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, Value
+from django.utils.module_loading import import_string
+
+from .models import Title
+
+WORD = re.compile(r'\w+')
+
+SEARCH_FIELDS = ('name', 'description')
+
+
+class BaseSearchBackend:
+    """Интерфейс полнотекстового поиска по произведениям.
+
+    Бэкенд отвечает за поисковый индекс (создание, обновление,
+    удаление записей) и за фильтрацию queryset произведений.
+    search() должен вернуть queryset, отсортированный по релевантности
+    и аннотированный полем search_rank (меньше - релевантнее).
+    """
+
+    def install(self):
+        """Создаем структуры индекса, если они нужны бэкенду."""
+
+    def index(self, title):
+        """Добавляем или обновляем произведение в индексе."""
+
+    def index_many(self, titles):
+        """Добавляем в индекс произведения, созданные через bulk_create."""
+        for title in titles:
+            self.index(title)
+
+    def remove(self, title_id):
+        """Удаляем произведение из индекса."""
+
+    def rebuild(self):
+        """Перестраиваем индекс по всей таблице произведений."""
+        for title in Title.objects.only(*SEARCH_FIELDS).iterator():
+            self.index(title)
+
+    def search(self, queryset, query, fields=SEARCH_FIELDS):
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Поиск без индекса через icontains, для баз без поддержки FTS."""
+
+    def search(self, queryset, query, fields=SEARCH_FIELDS):
+        for word in WORD.findall(query):
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(condition)
+        return queryset.annotate(search_rank=Value(0.0)).order_by('id')
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """Поиск по индексу FTS5 в SQLite.
+
+    Индекс хранится в виртуальной таблице, rowid которой совпадает
+    с id произведения. Слова запроса ищутся по префиксу и соединяются
+    через AND, релевантность считается функцией bm25 с большим весом
+    совпадений в названии.
+    """
+    table = 'reviews_title_search'
+    weights = {'name': 10.0, 'description': 1.0}
+
+    def install(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} '
+                f'USING fts5({", ".join(SEARCH_FIELDS)}, '
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def index(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [title.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                [title.pk, title.name, title.description]
+            )
+
+    def index_many(self, titles):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(title.pk,) for title in titles]
+            )
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                [(title.pk, title.name, title.description)
+                 for title in titles]
+            )
+
+    def remove(self, title_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [title_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, name, description) '
+                f'SELECT id, name, description FROM {Title._meta.db_table}'
+            )
+
+    def build_query(self, query, fields):
+        words = ' '.join(f'"{word}"*' for word in WORD.findall(query))
+        if not words:
+            return None
+        return f'{{{" ".join(fields)}}} : ({words})'
+
+    def search(self, queryset, query, fields=SEARCH_FIELDS):
+        match = self.build_query(query, fields)
+        if match is None:
+            return queryset.none()
+        weights = ', '.join(str(self.weights[field])
+                            for field in SEARCH_FIELDS)
+        # Виртуальную таблицу не описать моделью, поэтому соединяем ее
+        # с произведениями через extra(): один JOIN по rowid, ранг bm25
+        # берется из той же строки индекса без подзапроса на каждую строку.
+        return queryset.extra(
+            select={'search_rank': f'bm25({self.table}, {weights})'},
+            tables=[self.table],
+            where=[
+                f'{self.table}.rowid = {Title._meta.db_table}.id',
+                f'{self.table} MATCH %s',
+            ],
+            params=[match],
+        ).order_by('search_rank', 'id')
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Поиск средствами PostgreSQL (django.contrib.postgres).
+
+    Отдельный индекс не ведется, для скорости нужен GIN-индекс
+    по выражению to_tsvector на стороне базы.
+    """
+    config = 'russian'
+
+    def search(self, queryset, query, fields=SEARCH_FIELDS):
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+        vector = SearchVector(*fields, config=self.config)
+        search_query = SearchQuery(query, config=self.config)
+        return queryset.annotate(
+            search=vector,
+            search_rank=-SearchRank(vector, search_query)
+        ).filter(search=search_query).order_by('search_rank', 'id')
+
+
+DEFAULT_BACKENDS = {
+    'sqlite': 'reviews.search.SQLiteFTS5SearchBackend',
+    'postgresql': 'reviews.search.PostgresSearchBackend',
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    """Бэкенд из настройки TITLE_SEARCH_BACKEND или по типу базы."""
+    path = getattr(settings, 'TITLE_SEARCH_BACKEND', None) or (
+        DEFAULT_BACKENDS.get(
+            connection.vendor, 'reviews.search.SimpleSearchBackend'))
+    return import_string(path)()
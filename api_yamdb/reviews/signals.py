@@ -0,0 +1,85 @@
+from django.db.models import F
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from . import counters, leaderboard, ratings
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .search import get_search_backend
+
+
+def touch_titles(titles):
+    """Увеличиваем счетчик версии у произведений одним UPDATE
+    и помечаем их для пересчета рейтинга лучших.
+    """
+    titles.update(version=F('version') + 1, leaderboard_dirty=True)
+    leaderboard.titles_changed()
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    """Обновляем поисковый индекс при создании и изменении произведения,
+    измененное произведение пересчитываем в рейтинге лучших.
+    """
+    get_search_backend().index(instance)
+    if not kwargs.get('created'):
+        leaderboard.titles_changed()
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    """Удаляем произведение из поискового индекса."""
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        touch_titles(Title.objects.filter(pk__in=pk_set or ()))
+    else:
+        touch_titles(Title.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    touch_titles(Title.objects.filter(pk=instance.title_id))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    """Жанр входит в ответ по произведению, меняем версии его произведений.
+
+    При удалении вызывается до SET_NULL в GenreTitle, пока связи видны.
+    """
+    if not kwargs.get('created'):
+        touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    if not kwargs.get('created'):
+        touch_titles(Title.objects.filter(category=instance))
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Убираем отзыв из агрегатов произведения.
+
+    Срабатывает и для отзывов, удаленных каскадом вместе с автором
+    или произведением, в той же транзакции, что и удаление.
+    """
+    ratings.review_deleted(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """Уменьшаем счетчик комментариев отзыва, в том числе для
+    комментариев, удаленных каскадом вместе с автором.
+    """
+    counters.comment_deleted(instance)
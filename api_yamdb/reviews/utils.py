@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+
+# Сколько значений попадает в один запрос (IN, DELETE, UPDATE,
+# bulk_create), чтобы не упереться в лимит параметров запроса SQLite.
+CHUNK_SIZE = 500
+
+
+def chunks(values):
+    """Разбиваем значения на пачки по CHUNK_SIZE."""
+    values = list(values)
+    for start in range(0, len(values), CHUNK_SIZE):
+        yield values[start:start + CHUNK_SIZE]
+
+
+class BackgroundTask:
+    """Запуск фоновой работы способом из настройки setting:
+    'thread' - в фоновом потоке процесса,
+    'eager' - сразу в том же потоке (для тестов и отладки),
+    'command' - только управляющей командой.
+
+    У каждой задачи свой поток. Пока запуск ждет в очереди потока,
+    новый не ставится: он и так обработает все накопившееся.
+    """
+
+    def __init__(self, func, setting, name):
+        self.func = func
+        self.setting = setting
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix=name)
+        self._queued = threading.Event()
+
+    def __call__(self):
+        mode = getattr(settings, self.setting)
+        if mode == 'eager':
+            self.func()
+        elif mode == 'thread' and not self._queued.is_set():
+            self._queued.set()
+            self._executor.submit(self._run_in_thread)
+
+    def _run_in_thread(self):
+        self._queued.clear()
+        try:
+            self.func()
+        finally:
+            # У потока свое соединение с базой, закрываем его сами.
+            connection.close()
@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import caches
+
+from api.authentication import auth_cache
+from api.throttling import get_bucket_storage
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    auth_cache.clear()
+    get_bucket_storage().clear()
+    yield
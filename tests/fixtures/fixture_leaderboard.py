@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_leaderboard(settings):
+    """Рейтинг лучших пересчитывается сразу после фиксации транзакции,
+    чтобы тесты видели изменения без фонового потока.
+    """
+    settings.LEADERBOARD_REFRESH = 'eager'
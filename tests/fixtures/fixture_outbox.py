@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_outbox(settings):
+    """Письма из очереди отправляются сразу после фиксации транзакции,
+    чтобы тесты видели их в mail.outbox без фонового потока.
+    """
+    settings.EMAIL_OUTBOX_DELIVERY = 'eager'
@@ -0,0 +1,132 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import OperationalError, connections
+from rest_framework.test import APIClient
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+
+        response = create_single_review(
+            user_client, titles[0]['id'], 'Неплохо', 4
+        )
+        review_id = response.json()['id']
+        create_single_review(moderator_client, titles[0]['id'], 'Отлично', 9)
+        assert admin_client.get(title_url).json()['rating'] == 6, (
+            'Проверьте, что после создания отзывов рейтинг произведения '
+            'равен средней оценке.'
+        )
+
+        response = user_client.patch(
+            f'{title_url}reviews/{review_id}/', data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(title_url).json()['rating'] == 9, (
+            'Проверьте, что после изменения оценки в отзыве '
+            'рейтинг произведения пересчитывается.'
+        )
+
+        response = user_client.delete(f'{title_url}reviews/{review_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get(title_url).json()['rating'] == 9, (
+            'Проверьте, что после удаления отзыва '
+            'рейтинг произведения пересчитывается.'
+        )
+
+    def test_02_title_patch_keeps_rating(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        create_single_review(user_client, titles[0]['id'], 'Неплохо', 7)
+
+        response = admin_client.patch(title_url, data={'name': 'Новое имя'})
+        assert response.status_code == HTTPStatus.OK
+        data = admin_client.get(title_url).json()
+        assert data['name'] == 'Новое имя'
+        assert data['rating'] == 7, (
+            'Проверьте, что изменение произведения не сбрасывает его рейтинг.'
+        )
+
+    def test_03_rating_is_empty_without_reviews(self, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = create_single_review(
+            user_client, titles[0]['id'], 'Неплохо', 7
+        )
+        user_client.delete(f'{title_url}reviews/{response.json()["id"]}/')
+        assert admin_client.get(title_url).json()['rating'] is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_04_deleting_author_updates_rating(self, admin_client,
+                                               user_client, user,
+                                               moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Шедевр', 10)
+        create_single_review(moderator_client, titles[0]['id'], 'Плохо', 2)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating,
+                title.score_10, title.score_2) == (2, 1, 2, 0, 1), (
+            'Проверьте, что отзывы, удаленные вместе с автором, '
+            'убираются из рейтинга произведения.'
+        )
+
+    def test_05_concurrent_deletes(self, admin_client, user_client,
+                                   moderator_client, token_user):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(moderator_client, titles[0]['id'], 'Плохо', 2)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Шедевр', 10).json()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+        writers = 3
+        barrier = Barrier(writers)
+
+        def delete(_):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            barrier.wait()
+            try:
+                # SQLite в общем кэше не ждет блокировку, а сразу
+                # возвращает ошибку - повторяем запрос, как клиент.
+                for _ in range(100):
+                    try:
+                        return client.delete(url).status_code
+                    except OperationalError:
+                        time.sleep(0.01)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(writers) as executor:
+            statuses = list(executor.map(delete, range(writers)))
+        # Повтор после блокировки может прийти уже после фиксации
+        # удаления, поэтому успешный ответ допускается не более одного раза.
+        assert set(statuses) <= {
+            HTTPStatus.NO_CONTENT, HTTPStatus.NOT_FOUND
+        } and statuses.count(HTTPStatus.NO_CONTENT) <= 1, (
+            'Проверьте, что отзыв удаляется один раз, а параллельные '
+            'запросы получают 404.'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.score_10) == (
+            2, 1, 0
+        ), (
+            'Проверьте, что параллельное удаление отзыва не уменьшает '
+            'агрегаты произведения дважды.'
+        )
@@ -0,0 +1,108 @@
+import json
+from base64 import b64encode
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+
+
+def create_rated_titles(count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    Title.objects.bulk_create(
+        Title(name=f'Фильм {idx}', year=2000, description='',
+              category=category,
+              rating=None if idx % 3 == 0 else idx % 4)
+        for idx in range(count)
+    )
+    return Title.objects.order_by('id')
+
+
+def walk(client, url):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        pages.append(data)
+        url = data['next']
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleCursor:
+
+    def test_01_cursor_by_id(self, client):
+        titles = create_rated_titles(12)
+        pages = walk(client, '/api/v1/titles/?pagination=cursor&limit=5')
+        assert [len(page['results']) for page in pages] == [5, 5, 2]
+        assert 'count' not in pages[0], (
+            'Проверьте, что пагинация по курсору не считает общее '
+            'количество записей.'
+        )
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert ids == [title.id for title in titles]
+        assert pages[0]['previous'] is None
+
+        response = client.get(pages[-1]['previous'])
+        data = response.json()
+        assert [item['id'] for item in data['results']] == ids[5:10], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу.'
+        )
+
+    def test_02_cursor_by_rating(self, client):
+        titles = create_rated_titles(14)
+        pages = walk(
+            client, '/api/v1/titles/?pagination=cursor&ordering=rating&limit=4'
+        )
+        ids = [item['id'] for page in pages for item in page['results']]
+        expected = sorted(
+            titles,
+            key=lambda title: (title.rating is None, -(title.rating or 0),
+                               -title.id)
+        )
+        assert ids == [title.id for title in expected], (
+            'Проверьте, что пагинация по рейтингу обходит все произведения '
+            'по убыванию рейтинга, без рейтинга - в конце.'
+        )
+
+        back = []
+        url = pages[-1]['previous']
+        while url:
+            data = client.get(url).json()
+            back = [item['id'] for item in data['results']] + back
+            url = data['previous']
+        assert back == ids[:len(back)] and len(back) == len(ids) - len(
+            pages[-1]['results'])
+
+    def test_03_offset_still_works(self, client):
+        create_rated_titles(7)
+        data = client.get('/api/v1/titles/?limit=3&offset=3').json()
+        assert data['count'] == 7
+        assert len(data['results']) == 3
+
+    def test_04_invalid_cursor(self, client):
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_tampered_cursor(self, client):
+        create_rated_titles(3)
+        tampered = (
+            {'p': ['abc'], 'r': False},
+            {'p': [[1]], 'r': False},
+            {'p': [{'id': 1}], 'r': False},
+            {'p': [None], 'r': False},
+        )
+        for data in tampered:
+            cursor = b64encode(json.dumps(data).encode()).decode()
+            response = client.get(
+                '/api/v1/titles/', {'pagination': 'cursor', 'cursor': cursor})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор со значениями неверного типа '
+                'возвращает 404.'
+            )
+        cursor = b64encode(json.dumps(
+            {'p': ['x', 1], 'r': False}).encode()).decode()
+        response = client.get('/api/v1/titles/', {
+            'pagination': 'cursor', 'ordering': 'rating', 'cursor': cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND
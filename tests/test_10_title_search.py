@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.url, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.search(client, 'термин') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет произведения по началу '
+            'слова в названии.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` ищет по описанию произведения.'
+        )
+        assert self.search(client, 'крепкий терминатор') == []
+        assert self.search(client, '"*') == []
+
+    def test_02_search_ranks_name_matches_first(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.url}{titles[1]["id"]}/',
+            data={'description': 'Совсем не терминатор'}
+        )
+        assert self.search(client, 'терминатор') == [
+            'Терминатор', 'Крепкий орешек'
+        ], (
+            'Проверьте, что совпадения в названии выше по релевантности, '
+            'чем совпадения в описании.'
+        )
+
+    def test_03_index_follows_changes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.url}{titles[0]["id"]}/', data={'name': 'Робокоп'}
+        )
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'робокоп') == ['Робокоп']
+
+        admin_client.delete(f'{self.url}{titles[0]["id"]}/')
+        assert self.search(client, 'робокоп') == [], (
+            'Проверьте, что удаленное произведение пропадает из поиска.'
+        )
+
+    def test_04_name_filter_matches_substring(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.url, {'name': 'Крепкий', 'search': 'yippie'})
+        data = response.json()
+        assert [title['name'] for title in data['results']] == [
+            'Крепкий орешек'
+        ]
+        response = client.get(self.url, {'name': 'yippie'})
+        assert response.json()['results'] == [], (
+            'Проверьте, что фильтр `name` ищет только по названию.'
+        )
+        response = client.get(self.url, {'name': 'рмина'})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Терминатор'
+        ], (
+            'Проверьте, что фильтр `name` ищет подстроку в названии.'
+        )
+
+    def test_05_rank_uses_single_join(self, admin_client, client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as queries:
+            self.search(client, 'терминатор')
+        sql = next(query['sql'] for query in queries
+                   if 'bm25' in query['sql'])
+        assert sql.count('SELECT') == 1, (
+            'Проверьте, что ранг поиска считается через JOIN с индексом, '
+            'а не подзапросом для каждой строки.'
+        )
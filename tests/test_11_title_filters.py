@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleFilters:
+    url = '/api/v1/titles/'
+
+    def names(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_genre_any_and_all(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.names(client, genre='horror,drama') == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            'Проверьте, что фильтр `genre` со списком жанров по умолчанию '
+            'возвращает произведения хотя бы с одним из них.'
+        )
+        assert self.names(
+            client, genre='horror,comedy', genre_mode='all'
+        ) == ['Терминатор']
+        assert self.names(
+            client, genre='horror,drama', genre_mode='all'
+        ) == []
+
+    def test_02_genre_without_duplicates(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.url, {'genre': 'horror,comedy'})
+        data = response.json()
+        assert data['count'] == 1 and len(data['results']) == 1, (
+            'Проверьте, что фильтр по нескольким жанрам не дублирует '
+            'произведения.'
+        )
+
+    def test_03_exact_and_contains(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.names(client, genre='hor') == []
+        assert self.names(client, genre_contains='hor') == ['Терминатор']
+        assert self.names(client, category='film') == []
+        assert self.names(client, category_contains='film') == ['Терминатор']
+        assert self.names(client, category='films,books') == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+
+    def test_04_invalid_genre_mode(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.url, {'genre': 'horror', 'genre_mode': 'x'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_year_range(self, admin_client, client):
+        create_titles(admin_client)
+        assert self.names(client, year=1984) == ['Терминатор']
+        assert self.names(client, year=198) == [], (
+            'Проверьте, что фильтр `year` сравнивает год целиком.'
+        )
+        assert self.names(client, year_min=1985) == ['Крепкий орешек']
+        assert self.names(client, year_max=1985) == ['Терминатор']
+        assert self.names(client, year_min=1980, year_max=1990) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+        response = client.get(self.url, {'year_min': 'abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        for params in ({'year': '2000.5'}, {'year_max': '1985.5'}):
+            response = client.get(self.url, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что фильтры по году принимают только '
+                'целые числа.'
+            )
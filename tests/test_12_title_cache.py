@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.db.models import F
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleCache:
+    url = '/api/v1/titles/'
+
+    def test_01_list_is_cached(self, admin_client, client):
+        create_titles(admin_client)
+        assert client.get(self.url, {'limit': 5})['X-Cache'] == 'MISS'
+        response = client.get(f'{self.url}?limit=5')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET-запрос к `/api/v1/titles/` '
+            'отдается из кэша.'
+        )
+        assert response.json()['count'] == 2
+
+        stats = admin_client.get(f'{self.url}cache-stats/')
+        assert stats.status_code == HTTPStatus.OK
+        assert stats.json()['hits'] == 1
+        assert client.get(f'{self.url}cache-stats/').status_code == (
+            HTTPStatus.UNAUTHORIZED)
+
+    def test_02_review_invalidates_title(self, admin_client, user_client,
+                                         client):
+        titles, _, _ = create_titles(admin_client)
+        first = f'{self.url}{titles[0]["id"]}/'
+        second = f'{self.url}{titles[1]["id"]}/'
+        client.get(first)
+        client.get(second)
+        client.get(self.url)
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 8)
+        response = client.get(first)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что после нового отзыва кэш карточки произведения '
+            'сбрасывается.'
+        )
+        assert client.get(second)['X-Cache'] == 'HIT', (
+            'Проверьте, что отзыв сбрасывает кэш только своего произведения.'
+        )
+        assert client.get(self.url)['X-Cache'] == 'MISS'
+
+    def test_03_genre_change_invalidates_all(self, admin_client, client):
+        titles, _, genres = create_titles(admin_client)
+        detail = f'{self.url}{titles[0]["id"]}/'
+        client.get(detail)
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        response = client.get(detail)
+        assert response['X-Cache'] == 'MISS'
+        assert genres[0]['slug'] not in [
+            genre['slug'] for genre in response.json()['genre']
+        ]
+
+    def test_04_title_genres_patch(self, admin_client, client):
+        titles, _, genres = create_titles(admin_client)
+        detail = f'{self.url}{titles[1]["id"]}/'
+        client.get(detail)
+        admin_client.patch(detail, data={'genre': [genres[0]['slug']]},
+                           format='json')
+        response = client.get(detail)
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            genres[0]['slug']
+        ]
+
+    def test_05_detail_follows_db_version(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.url}{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        assert client.get(url)['X-Cache'] == 'HIT'
+        # Изменение в другом процессе: сигналы этого процесса
+        # не срабатывают, меняется только строка в базе.
+        Title.objects.filter(pk=titles[0]['id']).update(
+            name='Терминатор 2', version=F('version') + 1)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag
+        assert response.json()['name'] == 'Терминатор 2', (
+            'Проверьте, что тело карточки и ETag строятся по одной '
+            'версии произведения из базы.'
+        )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleETag:
+
+    def test_01_not_modified(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, (
+            'Проверьте, что ответ на GET-запрос к `/api/v1/titles/{id}/` '
+            'содержит заголовок ETag.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+        response = client.get(url, HTTP_IF_NONE_MATCH=f'"x", W/{etag}')
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что If-None-Match сравнивается со слабыми ETag '
+            '(с префиксом W/).'
+        )
+
+    def test_02_etag_changes(self, admin_client, user_client, client):
+        titles, categories, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etags = [client.get(url)['ETag']]
+
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        etags.append(client.get(url)['ETag'])
+        admin_client.patch(url, data={'name': 'Терминатор 2'})
+        etags.append(client.get(url)['ETag'])
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        etags.append(client.get(url)['ETag'])
+        assert len(set(etags)) == len(etags), (
+            'Проверьте, что ETag меняется после изменения отзывов, '
+            'самого произведения и его категории.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[0])
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category'] is None
+
+    def test_03_missing_title(self, client):
+        response = client.get('/api/v1/titles/999/', HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_save_does_not_reread_version(self, admin_client, settings):
+        # Рейтинг лучших пересчитывается вне сохранения.
+        settings.LEADERBOARD_REFRESH = 'command'
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        version = title.version
+        with CaptureQueriesContext(connection) as queries:
+            title.name = 'Терминатор 2'
+            title.save()
+        assert not [query for query in queries
+                    if query['sql'].startswith('SELECT')
+                    and 'reviews_title' in query['sql']], (
+            'Проверьте, что сохранение произведения не перечитывает '
+            'счетчик версии отдельным запросом.'
+        )
+        assert title.version == version + 1
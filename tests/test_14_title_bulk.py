@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitlesBulkSerializer
+from reviews.models import GenreTitle, Title
+from tests.utils import create_categories, create_genre
+
+
+def bulk_data(count, genres, categories):
+    return [
+        {
+            'name': f'Фильм {idx}',
+            'year': 1990 + idx % 20,
+            'genre': [genre['slug'] for genre in genres[:idx % 3 + 1]],
+            'category': categories[idx % 2]['slug'],
+        }
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleBulk:
+    url = '/api/v1/titles/'
+
+    def test_01_bulk_create(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = bulk_data(30, genres, categories)
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос администратора со списком '
+            'произведений к `/api/v1/titles/` возвращает статус 201.'
+        )
+        assert len(response.json()) == 30
+        assert response.json()[2]['genre'] == [
+            genre['slug'] for genre in genres
+        ]
+        assert Title.objects.count() == 30
+        assert GenreTitle.objects.count() == sum(
+            len(item['genre']) for item in data
+        )
+        search = admin_client.get(self.url, {'search': 'фильм', 'limit': 50})
+        assert search.json()['count'] == 30, (
+            'Проверьте, что произведения из пачки попадают в поисковый индекс.'
+        )
+
+    def test_02_query_count_does_not_grow(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        counts = []
+        # Пачки меньше лимита параметров SQLite (999) на один INSERT.
+        for start, count in ((0, 5), (100, 30)):
+            data = bulk_data(count, genres, categories)
+            for item in data:
+                item['name'] += f' {start}'
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.post(
+                    self.url, data=data, format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что количество запросов при массовом создании '
+            'произведений не зависит от размера пачки.'
+        )
+
+    def test_03_per_item_errors(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = bulk_data(4, genres, categories)
+        admin_client.post(self.url, data=data[:1], format='json')
+        data[1]['category'] = 'unknown'
+        data[3] = dict(data[2])
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert 'category' in errors[1]
+        assert errors[0] == {} and errors[2] == {} and errors[3] == {}
+
+        data[1]['category'] = categories[0]['slug']
+        response = admin_client.post(self.url, data=data, format='json')
+        errors = response.json()
+        assert [bool(error) for error in errors] == [True, False, False, True]
+        assert Title.objects.count() == 1, (
+            'Проверьте, что при ошибке в пачке не создается '
+            'ни одно произведение.'
+        )
+
+    def test_04_bulk_requires_admin(self, admin_client, user_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        response = user_client.post(
+            self.url, data=bulk_data(2, genres, categories), format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_05_ids_of_new_rows(self, admin_client, monkeypatch):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = bulk_data(3, genres, categories)
+        data[1].update(name=data[0]['name'], year=data[0]['year'])
+        # Произведения с той же парой (name, year) появились параллельно,
+        # уже после проверки уникальности.
+        existing = Title.objects.create(name=data[0]['name'],
+                                        year=data[0]['year'])
+        monkeypatch.setattr(TitlesBulkSerializer, 'validate_unique',
+                            lambda self, validated_data: None)
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        ids = [item['id'] for item in response.json()]
+        assert existing.pk not in ids and len(set(ids)) == 3, (
+            'Проверьте, что ответ содержит id созданных произведений, '
+            'а не найденных по паре (name, year).'
+        )
+        for item, pk in zip(data, ids):
+            title = Title.objects.get(pk=pk)
+            assert (title.name, title.category.slug) == (
+                item['name'], item['category']
+            )
+            assert sorted(title.genre.values_list('slug', flat=True)) == (
+                sorted(item['genre'])
+            )
+        assert not GenreTitle.objects.filter(title=existing).exists()
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitlesSerializer
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleValues:
+    url = '/api/v1/titles/'
+
+    def test_01_same_output(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 7)
+        admin_client.delete('/api/v1/categories/books/')
+
+        response = client.get(self.url)
+        expected = TitlesSerializer(
+            Title.objects.order_by('id'), many=True
+        ).data
+        results = sorted(response.json()['results'], key=lambda t: t['id'])
+        assert json.dumps(results) == json.dumps(expected), (
+            'Проверьте, что список произведений совпадает с выводом '
+            'TitlesSerializer.'
+        )
+
+    def test_02_constant_queries(self, admin_client, client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(self.url, {'limit': 1, 'count': 'false'})
+        small = len(queries)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(self.url, {'limit': 10, 'count': 'false'})
+        assert len(queries) == small
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SparseFields:
+
+    def test_01_titles_fields(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/titles/', {'fields': 'id,name'})
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name'}, (
+                'Проверьте, что параметр `fields` оставляет в ответе только '
+                'перечисленные поля.'
+            )
+        sql = ' '.join(query['sql'] for query in queries)
+        assert 'description' not in sql
+        assert 'reviews_genretitle' not in sql, (
+            'Проверьте, что жанры не загружаются, если поле `genre` '
+            'не запрошено.'
+        )
+
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            {'omit': 'description,genre'}
+        )
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'rating', 'category'
+        }
+
+    def test_02_unknown_field(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'fields': 'id,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_reviews_and_comments(self, admin_client, admin, user_client,
+                                     user, client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'fields': 'id,score'})
+        assert [set(review) for review in response.json()['results']] == [
+            {'id', 'score'}, {'id', 'score'}
+        ]
+        assert '"text"' not in queries[-1]['sql']
+
+        response = client.get(
+            f'{url}{reviews[0]["id"]}/comments/', {'omit': 'text'}
+        )
+        assert set(response.json()['results'][0]) == {
+            'id', 'author', 'pub_date'
+        }
+
+    def test_04_fields_ignored_on_write(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?fields=id',
+            data={'text': 'Хорошо', 'score': 8}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['text'] == 'Хорошо'
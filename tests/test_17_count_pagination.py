@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+def count_queries(queries):
+    return sum('COUNT(' in query['sql'] for query in queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CountPagination:
+
+    def test_01_count_is_cached(self, admin_client, admin, user_client, user,
+                                moderator_client, moderator, client):
+        _, titles = create_reviews(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        })
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(url, {'limit': 2}).json()
+        assert data['count'] == 3 and count_queries(queries) == 1
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(url, {'limit': 2}).json()
+        assert data['count'] == 3
+        assert count_queries(queries) == 0, (
+            'Проверьте, что количество отзывов берется из кэша.'
+        )
+
+    def test_02_count_invalidated(self, admin_client, user_client,
+                                  moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'Раз', 5)
+        create_single_review(moderator_client, titles[0]['id'], 'Два', 6)
+        assert client.get(url, {'limit': 1}).json()['count'] == 2
+        create_single_review(admin_client, titles[0]['id'], 'Три', 7)
+        assert client.get(url, {'limit': 1}).json()['count'] == 3, (
+            'Проверьте, что новый отзыв сбрасывает закэшированное количество.'
+        )
+
+    def test_03_count_free(self, admin_client, client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                '/api/v1/titles/', {'limit': 1, 'count': 'false'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and data['has_next'] is True
+        assert data['next'] and count_queries(queries) == 0
+        data = client.get(data['next']).json()
+        assert data['has_next'] is False and data['next'] is None
+        assert len(data['results']) == 1
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+def create_many_reviews(django_user_model, title_id, count):
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'reader{idx}',
+                          email=f'reader{idx}@yamdb.fake')
+        for idx in range(count)
+    )
+    users = django_user_model.objects.filter(username__startswith='reader')
+    for idx, user in enumerate(users):
+        Review.objects.create(title_id=title_id, author=user,
+                              text=f'Отзыв {idx}', score=idx % 10 + 1)
+    return list(Review.objects.filter(title_id=title_id).order_by(
+        '-pub_date', '-id').values_list('id', flat=True))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ReviewCursor:
+
+    def test_01_newest_first_feed(self, admin_client, client,
+                                  django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        expected = create_many_reviews(django_user_model, titles[0]['id'], 12)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               '?pagination=cursor&limit=5')
+        ids = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data
+            ids.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert ids == expected, (
+            'Проверьте, что курсор по `/api/v1/titles/{title_id}/reviews/` '
+            'обходит отзывы от новых к старым без пропусков и повторов.'
+        )
+
+    def test_02_index_used(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        queryset = Title.objects.get(pk=titles[0]['id']).reviews.order_by(
+            '-pub_date', '-id')[:5]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert 'review_title_pub_date_idx' in plan
+        assert 'TEMP B-TREE' not in plan, (
+            'Проверьте, что сортировка отзывов произведения идет по индексу.'
+        )
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReviewCreate:
+
+    def test_01_concurrent_writers(self, admin_client, token_user):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        writers = 4
+        barrier = Barrier(writers)
+
+        def post(idx):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            barrier.wait()
+            try:
+                # SQLite в общем кэше не ждет блокировку, а сразу
+                # возвращает ошибку - повторяем запрос, как это сделал бы
+                # клиент. Транзакция при этом откатывается целиком.
+                for _ in range(100):
+                    try:
+                        return client.post(
+                            url, data={'text': f'Отзыв {idx}', 'score': 5}
+                        ).status_code
+                    except OperationalError:
+                        time.sleep(0.01)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(writers) as executor:
+            statuses = list(executor.map(post, range(writers)))
+        # Повтор после блокировки может прийти уже после фиксации отзыва,
+        # поэтому успешный ответ допускается не более одного раза.
+        assert set(statuses) <= {
+            HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST
+        } and statuses.count(HTTPStatus.CREATED) <= 1, (
+            'Проверьте, что при одновременных запросах одного пользователя '
+            'создается только один отзыв, остальные получают ответ 400.'
+        )
+        assert Review.objects.count() == 1
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.review_count, title.score_sum) == (1, 5)
+
+    def test_02_single_round_trip(self, admin_client, user_client,
+                                  settings):
+        # Рейтинг лучших пересчитывается вне запроса.
+        settings.LEADERBOARD_REFRESH = 'command'
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(url, data={'text': 'Да', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        selects = [query['sql'] for query in queries
+                   if query['sql'].startswith('SELECT')
+                   and 'reviews_user' not in query['sql']]
+        assert selects == [], (
+            'Проверьте, что создание отзыва не выполняет SELECT-запросов '
+            'к произведению и отзывам перед вставкой.'
+        )
+
+    def test_03_missing_title(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/999/reviews/', data={'text': 'Да', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert Review.objects.count() == 0
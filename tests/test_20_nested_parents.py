@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+def parent_queries(queries, table):
+    return [query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedParents:
+
+    def test_01_comment_create_single_lookup(self, admin_client, admin,
+                                             user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == HTTPStatus.CREATED
+        lookups = parent_queries(queries, 'reviews_review')
+        assert len(lookups) == 1, (
+            'Проверьте, что отзыв для вложенного маршрута комментариев '
+            'ищется один раз за запрос.'
+        )
+        assert 'JOIN "reviews_title"' in lookups[0]
+
+    def test_02_detail_without_parent_lookup(self, admin_client, admin,
+                                             user_client, user, client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/{comments[0]["id"]}/')
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert parent_queries(queries, 'reviews_review') == []
+
+    def test_03_wrong_parent(self, admin_client, admin, user_client, user,
+                             client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        other = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        assert client.get(
+            f'{other}{reviews[0]["id"]}/comments/{comments[0]["id"]}/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий не доступен по маршруту '
+            'чужого произведения.'
+        )
+        assert client.get(
+            f'{other}{reviews[0]["id"]}/comments/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert user_client.post(
+            f'{other}{reviews[0]["id"]}/comments/', data={'text': 'Нет'}
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            '/api/v1/titles/999/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_empty_list(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
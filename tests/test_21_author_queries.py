@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, User
+from tests.utils import create_titles
+
+
+def fill(title_id, count):
+    User.objects.bulk_create(
+        User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+        for idx in range(count)
+    )
+    authors = User.objects.filter(username__startswith='author')
+    Review.objects.bulk_create(
+        Review(title_id=title_id, author=author, text='Отзыв', score=5)
+        for author in authors
+    )
+    review = Review.objects.filter(title_id=title_id).first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text='Комментарий')
+        for author in authors
+    )
+    return review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AuthorQueries:
+
+    @pytest.mark.parametrize('count', [2, 20])
+    def test_01_reviews_list(self, admin_client, client,
+                             django_assert_num_queries, count):
+        titles, _, _ = create_titles(admin_client)
+        fill(titles[0]['id'], count)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # Произведение из маршрута и страница отзывов вместе с авторами.
+        with django_assert_num_queries(2):
+            response = client.get(url, {'limit': 50, 'count': 'false'})
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert len(results) == count
+        assert {review['author'] for review in results} == {
+            f'author{idx}' for idx in range(count)
+        }, 'Проверьте, что в отзывах выводится username автора.'
+
+    @pytest.mark.parametrize('count', [2, 20])
+    def test_02_comments_list(self, admin_client, client,
+                              django_assert_num_queries, count):
+        titles, _, _ = create_titles(admin_client)
+        review = fill(titles[0]['id'], count)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{review.id}/comments/')
+        with django_assert_num_queries(2):
+            response = client.get(url, {'limit': 50, 'count': 'false'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == count
+
+    def test_03_cursor_and_detail(self, admin_client, client,
+                                  django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        review = fill(titles[0]['id'], 10)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_num_queries(2):
+            client.get(url, {'pagination': 'cursor', 'limit': 5})
+        with django_assert_num_queries(1):
+            response = client.get(f'{url}{review.id}/')
+        assert response.json()['author'] == review.author.username
+
+    def test_04_author_not_joined_when_omitted(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        fill(titles[0]['id'], 3)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                       {'omit': 'author'})
+        assert 'reviews_user' not in queries[-1]['sql']
@@ -0,0 +1,124 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.counters import recalculate_comments_count
+from reviews.models import Review
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22CommentsCount:
+
+    def test_01_counter(self, admin_client, admin, user_client, user,
+                        client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        counts = {review['id']: review['comments_count']
+                  for review in client.get(url).json()['results']}
+        assert counts == {reviews[0]['id']: 2, reviews[1]['id']: 0}, (
+            'Проверьте, что в ответе на GET-запрос к отзывам есть поле '
+            '`comments_count` с количеством комментариев.'
+        )
+
+        create_single_comment(user_client, titles[0]['id'],
+                              reviews[1]['id'], 'Еще')
+        response = admin_client.delete(
+            f'{url}{reviews[0]["id"]}/comments/{comments[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(f'{url}{reviews[1]["id"]}/')
+        assert response.json()['comments_count'] == 1
+        assert client.get(f'{url}{reviews[0]["id"]}/').json()[
+            'comments_count'] == 1, (
+            'Проверьте, что счетчик комментариев уменьшается '
+            'при удалении комментария.'
+        )
+
+    def test_02_no_subqueries(self, admin_client, admin, user_client, user,
+                              client):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert 'reviews_comment' not in ' '.join(
+            query['sql'] for query in queries
+        ), (
+            'Проверьте, что количество комментариев не считается '
+            'запросами к таблице комментариев.'
+        )
+
+    def test_03_review_update_keeps_counter(self, admin_client, admin,
+                                            user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        response = admin_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['comments_count'] == 2
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 2
+
+    def test_04_recalculate(self, admin_client, admin, user_client, user):
+        _, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Review.objects.update(comments_count=0)
+        recalculate_comments_count()
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 2
+
+    def test_05_deleting_author_updates_counter(self, admin_client, admin,
+                                                user_client, user):
+        _, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 1, (
+            'Проверьте, что комментарии, удаленные вместе с автором, '
+            'убираются из счетчика отзыва.'
+        )
+
+    def test_06_concurrent_deletes(self, admin_client, admin, user_client,
+                                   user, token_user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/{comments[1]["id"]}/')
+        writers = 3
+        barrier = Barrier(writers)
+
+        def delete(_):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            barrier.wait()
+            try:
+                for _ in range(100):
+                    try:
+                        return client.delete(url).status_code
+                    except OperationalError:
+                        time.sleep(0.01)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(writers) as executor:
+            statuses = list(executor.map(delete, range(writers)))
+        assert set(statuses) <= {
+            HTTPStatus.NO_CONTENT, HTTPStatus.NOT_FOUND
+        } and statuses.count(HTTPStatus.NO_CONTENT) <= 1
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 1, (
+            'Проверьте, что параллельное удаление комментария не уменьшает '
+            'счетчик дважды.'
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from reviews.ratings import recalculate_ratings
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleScores:
+
+    def test_01_distribution(self, admin_client, user_client,
+                             moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/scores/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{id}/scores/` '
+            'доступен без токена.'
+        )
+        data = response.json()
+        assert data['count'] == 0
+        assert data['median'] is None
+        assert list(data['distribution']) == [str(s) for s in range(11)]
+
+        for api_client, score in ((admin_client, 2), (user_client, 7),
+                                  (moderator_client, 10)):
+            create_single_review(api_client, titles[0]['id'], 'Ок', score)
+        data = client.get(url).json()
+        assert data['count'] == 3
+        assert {score: count for score, count in data['distribution'].items()
+                if count} == {'2': 1, '7': 1, '10': 1}
+        assert data['median'] == 7
+        assert data['percentiles'] == {
+            '10': 2, '25': 2, '75': 10, '90': 10
+        }
+
+    def test_02_update_and_delete(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        first = create_single_review(
+            admin_client, titles[0]['id'], 'А', 4
+        ).json()
+        create_single_review(user_client, titles[0]['id'], 'Б', 8)
+        assert client.get(f'{url}scores/').json()['median'] == 6
+
+        admin_client.patch(f'{url}reviews/{first["id"]}/', data={'score': 9})
+        data = client.get(f'{url}scores/').json()
+        assert data['distribution']['4'] == 0
+        assert data['distribution']['9'] == 1, (
+            'Проверьте, что при изменении оценки отзыва гистограмма '
+            'обновляется.'
+        )
+        admin_client.delete(f'{url}reviews/{first["id"]}/')
+        data = client.get(f'{url}scores/').json()
+        assert data['count'] == 1
+        assert data['distribution']['9'] == 0
+
+    def test_03_single_query(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'А', 4)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/scores/')
+        assert len(queries) == 1
+        assert 'reviews_review' not in queries[0]['sql']
+        assert client.get(
+            '/api/v1/titles/999/scores/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_recalculate(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'А', 4)
+        Title.objects.update(score_4=0)
+        recalculate_ratings()
+        assert Title.objects.get(pk=titles[0]['id']).score_4 == 1
+
+    def test_05_invalid_id(self, client):
+        response = client.get('/api/v1/titles/abc/scores/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для нечислового id распределение оценок '
+            'возвращает 404, как и карточка произведения.'
+        )
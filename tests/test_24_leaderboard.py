@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import LeaderboardEntry, Title
+from tests.utils import create_single_review, create_titles
+
+
+def top_ids(client, **params):
+    response = client.get('/api/v1/titles/top/', params)
+    assert response.status_code == HTTPStatus.OK
+    return [entry['title']['id'] for entry in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Leaderboard:
+
+    def test_01_bayesian_order(self, admin_client, user_client,
+                               moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert top_ids(client) == [], (
+            'Проверьте, что произведения без отзывов не попадают в рейтинг '
+            'лучших.'
+        )
+        create_single_review(user_client, first, 'Шедевр', 10)
+        for api_client, score in ((admin_client, 9), (user_client, 9),
+                                  (moderator_client, 8)):
+            create_single_review(api_client, second, 'Хорошо', score)
+        assert top_ids(client) == [second, first], (
+            'Проверьте, что единственная оценка 10 не поднимает '
+            'произведение выше нескольких высоких оценок.'
+        )
+        result = client.get('/api/v1/titles/top/').json()['results']
+        assert result[0]['score'] == pytest.approx((26 + 5 * 5) / (3 + 5))
+        assert result[0]['title']['name'] == titles[1]['name']
+
+    def test_02_scopes(self, admin_client, user_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        for title in titles:
+            create_single_review(user_client, title['id'], 'Ок', 7)
+        assert top_ids(client, genre=genres[0]['slug']) == [titles[0]['id']]
+        assert top_ids(client, genre=genres[2]['slug']) == [titles[1]['id']]
+        assert top_ids(client, category=categories[1]['slug']) == [
+            titles[1]['id']
+        ]
+        response = client.get('/api/v1/titles/top/',
+                              {'genre': genres[0]['slug'],
+                               'category': categories[0]['slug']})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/',
+                           data={'genre': [genres[0]['slug']],
+                                 'category': categories[0]['slug']},
+                           format='json')
+        assert set(top_ids(client, genre=genres[0]['slug'])) == {
+            title['id'] for title in titles
+        }, 'Проверьте, что рейтинг по жанру учитывает смену жанров.'
+        assert top_ids(client, genre=genres[2]['slug']) == []
+        assert top_ids(client, category=categories[1]['slug']) == []
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert top_ids(client, genre=genres[0]['slug']) == []
+
+    def test_03_incremental_refresh(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'А', 3)
+        review = create_single_review(
+            user_client, titles[1]['id'], 'Б', 6).json()
+        assert top_ids(client) == [titles[1]['id'], titles[0]['id']]
+
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{review["id"]}/'
+        user_client.patch(url, data={'score': 1})
+        assert top_ids(client) == [titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что рейтинг лучших обновляется при изменении '
+            'оценки.'
+        )
+        user_client.delete(url)
+        assert top_ids(client) == [titles[0]['id']]
+
+    def test_04_cursor(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        for title in titles:
+            create_single_review(user_client, title['id'], 'Ок', 7)
+        response = client.get('/api/v1/titles/top/', {'limit': 1}).json()
+        assert len(response['results']) == 1
+        assert response['next']
+        second = client.get(response['next']).json()
+        assert [entry['title']['id'] for entry in (
+            response['results'] + second['results'])] == [
+            titles[1]['id'], titles[0]['id']
+        ], 'Проверьте, что при равной оценке выше новое произведение.'
+        assert second['next'] is None
+
+    def test_05_rebuild_command(self, admin_client, user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Ок', 7)
+        top_ids(client)
+        LeaderboardEntry.objects.all().delete()
+        call_command('rebuild_leaderboard')
+        assert LeaderboardEntry.objects.filter(
+            title_id=titles[0]['id']).count() == 4
+
+    def test_06_read_only_get(self, admin_client, user_client, client,
+                              settings):
+        settings.LEADERBOARD_REFRESH = 'command'
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Ок', 7)
+        assert Title.objects.filter(leaderboard_dirty=True).exists()
+        with CaptureQueriesContext(connection) as queries:
+            assert top_ids(client) == []
+        assert all(query['sql'].startswith('SELECT') for query in queries), (
+            'Проверьте, что запрос рейтинга лучших ничего не пишет в базу.'
+        )
+        call_command('refresh_leaderboard')
+        assert top_ids(client) == [titles[0]['id']], (
+            'Проверьте, что команда refresh_leaderboard пересчитывает '
+            'измененные произведения.'
+        )
+        assert not Title.objects.filter(leaderboard_dirty=True).exists()
@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title, User
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25BulkModeration:
+    url = '/api/v1/moderation/bulk-delete/'
+
+    def test_01_permissions(self, admin_client, moderator_client,
+                            user_client, client):
+        data = {'reviews': [1]}
+        assert client.post(self.url, data=data, format='json').status_code \
+            == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            self.url, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовое удаление недоступно обычному '
+            'пользователю.'
+        )
+        assert moderator_client.post(
+            self.url, data=data, format='json'
+        ).status_code == HTTPStatus.OK
+        assert admin_client.post(
+            self.url, data={}, format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_by_ids(self, admin_client, admin, user_client, user,
+                       moderator_client, client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = moderator_client.post(self.url, data={
+            'reviews': [reviews[0]['id']],
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'reviews': 1, 'comments': 2}, (
+            'Проверьте, что вместе с отзывом удаляются его комментарии.'
+        )
+        assert not Comment.objects.exists()
+        title = Title.objects.get(pk=titles[0]['id'])
+        remaining = Review.objects.get(pk=reviews[1]['id'])
+        assert title.review_count == 1
+        assert title.score_sum == remaining.score
+        assert client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/'
+        ).json()['rating'] == remaining.score
+
+    def test_03_by_author(self, admin_client, user_client, user,
+                          moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        for title in titles:
+            create_single_review(user_client, title['id'], 'Спам', 10)
+        kept = create_single_review(
+            admin_client, titles[0]['id'], 'Ок', 4).json()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{kept["id"]}/'
+        for _ in range(3):
+            user_client.post(f'{url}comments/', data={'text': 'Спам'})
+        admin_client.post(f'{url}comments/', data={'text': 'Ок'})
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+
+        response = moderator_client.post(
+            self.url, data={'author': user.username}, format='json')
+        assert response.json() == {'reviews': 2, 'comments': 3}
+        assert not Review.objects.filter(author=user).exists()
+        assert Review.objects.get(pk=kept['id']).comments_count == 1
+        detail = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert detail['X-Cache'] == 'MISS'
+        assert detail.json()['rating'] == 4, (
+            'Проверьте, что рейтинг произведения пересчитывается после '
+            'массового удаления.'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating is None
+
+    def test_04_constant_queries(self, admin_client, moderator_client,
+                                 settings):
+        # Рейтинг лучших пересчитывается вне запроса.
+        settings.LEADERBOARD_REFRESH = 'command'
+        titles, _, _ = create_titles(admin_client)
+        User.objects.bulk_create(
+            User(username=f'spam{idx}', email=f'spam{idx}@yamdb.fake')
+            for idx in range(40)
+        )
+        Review.objects.bulk_create(
+            Review(title_id=titles[idx % 2]['id'], author=author,
+                   text='Спам', score=10)
+            for idx, author in enumerate(User.objects.filter(
+                username__startswith='spam'))
+        )
+        ids = list(Review.objects.values_list('pk', flat=True))
+        # Первый запрос загружает модератора в кэш аутентификации.
+        moderator_client.post(self.url, data={'reviews': [10 ** 6]},
+                              format='json')
+        counts = []
+        for chunk in (ids[:2], ids[2:]):
+            with CaptureQueriesContext(connection) as queries:
+                moderator_client.post(
+                    self.url, data={'reviews': chunk}, format='json')
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что количество запросов не зависит от числа '
+            'удаляемых отзывов.'
+        )
+        assert not Review.objects.exists()
+
+    def test_05_large_id_lists_are_chunked(self, admin_client, user_client,
+                                           moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Спам', 10).json()
+        ids = list(range(10 ** 6, 10 ** 6 + 5000)) + [review['id']]
+        with CaptureQueriesContext(connection) as queries:
+            response = moderator_client.post(
+                self.url, data={'reviews': ids, 'comments': ids},
+                format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['reviews'] == 1
+        assert max(query['sql'].count(',') for query in queries) < 999, (
+            'Проверьте, что списки id передаются в запросы пачками, '
+            'не упираясь в лимит параметров SQLite.'
+        )
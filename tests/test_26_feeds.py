@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, User
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Feeds:
+
+    def test_01_reviews_feed(self, admin_client, admin, user_client, user,
+                             client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = client.get('/api/v1/reviews/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/reviews/` возвращает '
+            'ленту отзывов по всем произведениям.'
+        )
+        data = response.json()
+        assert set(data) == {'next', 'previous', 'results'}
+        assert [review['id'] for review in data['results']] == [
+            reviews[1]['id'], reviews[0]['id']
+        ]
+        assert data['results'][0]['title'] == titles[0]['id']
+        assert data['results'][0]['author'] == user.username
+
+        oldest = client.get('/api/v1/reviews/', {'ordering': 'oldest'})
+        assert [review['id'] for review in oldest.json()['results']] == [
+            reviews[0]['id'], reviews[1]['id']
+        ]
+
+    def test_02_comments_feed(self, admin_client, admin, user_client, user,
+                              client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = client.get('/api/v1/comments/')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [comment['id'] for comment in results] == [
+            comments[1]['id'], comments[0]['id']
+        ]
+        assert results[0]['review'] == reviews[0]['id']
+        assert results[0]['title'] == titles[0]['id']
+        assert client.post(
+            '/api/v1/comments/', data={'text': 'Нет'}
+        ).status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+    def test_03_since(self, admin_client, admin, user_client, user, client):
+        _, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        first = Review.objects.get(pk=reviews[0]['id'])
+        response = client.get('/api/v1/reviews/',
+                              {'since': first.pub_date.isoformat()})
+        assert [review['id'] for review in response.json()['results']] == [
+            reviews[1]['id']
+        ], 'Проверьте, что параметр since отсекает более старые публикации.'
+        assert client.get(
+            '/api/v1/reviews/', {'since': 'вчера'}
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_cursor_constant_queries(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        User.objects.bulk_create(
+            User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            for idx in range(12)
+        )
+        Review.objects.bulk_create(
+            Review(title_id=titles[idx % 2]['id'], author=author,
+                   text='Отзыв', score=5)
+            for idx, author in enumerate(User.objects.filter(
+                username__startswith='author'))
+        )
+        seen = []
+        url = '/api/v1/reviews/?limit=5'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                data = client.get(url).json()
+            assert len(queries) == 1, (
+                'Проверьте, что страница ленты загружается одним запросом '
+                'вместе с авторами.'
+            )
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert len(seen) == len(set(seen)) == 12
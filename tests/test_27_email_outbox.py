@@ -0,0 +1,122 @@
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews import outbox
+from reviews.models import OutgoingEmail
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise SMTPException('Сервер недоступен')
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+def signup(client, idx=0):
+    return client.post('/api/v1/auth/signup/', data={
+        'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27EmailOutbox:
+
+    def test_01_signup_does_not_send(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        response = signup(client)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо кладется в очередь, '
+            'а не отправляется в запросе.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipients == ['user0@yamdb.fake']
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['user0@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.message == '', (
+            'Проверьте, что после отправки текст письма с кодом '
+            'не хранится в очереди.'
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1
+
+    def test_02_mail_failure_does_not_fail_signup(self, client, settings):
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        response = signup(client)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибка почтового сервера не ломает регистрацию.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'SMTPException' in email.last_error
+        assert email.next_attempt_at > timezone.now()
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend')
+        assert outbox.send_pending() == 0
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert outbox.send_pending() == 1
+        assert len(mail.outbox) == 1
+
+    def test_03_one_connection_per_batch(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        for idx in range(5):
+            signup(client, idx)
+        settings.EMAIL_BACKEND = f'{__name__}.CountingBackend'
+        CountingBackend.opened = 0
+        assert outbox.send_pending(batch_size=3) == 5
+        assert CountingBackend.opened == 2, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+        assert len(mail.outbox) == 5
+
+    def test_04_gives_up_after_max_attempts(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        signup(client)
+        OutgoingEmail.objects.update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+        assert outbox.send_pending() == 0
+        assert len(mail.outbox) == 0
+
+    def test_05_purge_old_emails(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        for idx in range(4):
+            signup(client, idx)
+        sent, abandoned, pending, recent = OutgoingEmail.objects.order_by(
+            'pk')
+        old = timezone.now() - timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETENTION + 60)
+        OutgoingEmail.objects.filter(pk=sent.pk).update(
+            sent_at=old, created=old)
+        OutgoingEmail.objects.filter(pk=abandoned.pk).update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS, created=old)
+        OutgoingEmail.objects.filter(pk=pending.pk).update(
+            attempts=1, created=old)
+        OutgoingEmail.objects.filter(pk=recent.pk).update(
+            sent_at=timezone.now())
+
+        call_command('send_outbox')
+        assert set(OutgoingEmail.objects.values_list('pk', flat=True)) == {
+            pending.pk, recent.pk
+        }, (
+            'Проверьте, что send_outbox удаляет старые отправленные '
+            'и брошенные письма, но оставляет ожидающие отправки.'
+        )
@@ -0,0 +1,114 @@
+import re
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.confirmation import confirmation_codes
+from reviews.models import ConfirmationCode
+
+SIGNUP = '/api/v1/auth/signup/'
+TOKEN = '/api/v1/auth/token/'
+DATA = {'username': 'newbie', 'email': 'newbie@yamdb.fake'}
+
+
+def last_code():
+    return re.match(r'(\w+) - ', mail.outbox[-1].body).group(1)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ConfirmationCodes:
+
+    def test_01_code_is_single_use(self, client):
+        client.post(SIGNUP, data=DATA)
+        code = last_code()
+        stored = ConfirmationCode.objects.get(username=DATA['username'])
+        assert code not in stored.digest, (
+            'Проверьте, что код подтверждения хранится в виде хэша.'
+        )
+        # Другой процесс или перезапуск сервера: кэши процесса пусты.
+        for cache in caches.all():
+            cache.clear()
+        response = client.post(TOKEN, data={
+            'username': DATA['username'], 'confirmation_code': code})
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+        response = client.post(TOKEN, data={
+            'username': DATA['username'], 'confirmation_code': code})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения нельзя использовать дважды.'
+        )
+
+    def test_02_resignup_rotates_code(self, client):
+        client.post(SIGNUP, data=DATA)
+        old_code = last_code()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(SIGNUP, data=DATA)
+        assert response.status_code == HTTPStatus.OK
+        user_queries = [query['sql'] for query in queries
+                        if 'reviews_user' in query['sql']]
+        assert len(user_queries) == 1 and user_queries[0].startswith(
+            'SELECT'), (
+            'Проверьте, что повторная регистрация делает один запрос '
+            'к пользователям и не перезаписывает строку пользователя.'
+        )
+        code_queries = [query['sql'] for query in queries
+                        if 'reviews_confirmationcode' in query['sql']]
+        assert len(code_queries) == 1 and code_queries[0].startswith(
+            'UPDATE'), (
+            'Проверьте, что повторная регистрация меняет код '
+            'одним запросом UPDATE.'
+        )
+        assert client.post(TOKEN, data={
+            'username': DATA['username'], 'confirmation_code': old_code
+        }).status_code == HTTPStatus.BAD_REQUEST
+        assert client.post(TOKEN, data={
+            'username': DATA['username'], 'confirmation_code': last_code()
+        }).status_code == HTTPStatus.OK
+
+    def test_03_token_does_not_write_user(self, client):
+        client.post(SIGNUP, data=DATA)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(TOKEN, data={
+                'username': DATA['username'],
+                'confirmation_code': last_code()})
+        assert response.status_code == HTTPStatus.OK
+        assert not [query['sql'] for query in queries
+                    if 'reviews_user' in query['sql']
+                    and not query['sql'].startswith('SELECT')]
+        code_queries = [query['sql'] for query in queries
+                        if 'reviews_confirmationcode' in query['sql']]
+        assert len(code_queries) == 1 and code_queries[0].startswith(
+            'DELETE'), (
+            'Проверьте, что код проверяется и гасится одним запросом DELETE.'
+        )
+
+    def test_04_code_expires(self, client, settings):
+        settings.CONFIRMATION_CODE_TIMEOUT = 0.05
+        code = confirmation_codes.issue(DATA['username'])
+        time.sleep(0.1)
+        assert not confirmation_codes.consume(DATA['username'], code), (
+            'Проверьте, что у кода подтверждения есть срок действия.'
+        )
+        settings.CONFIRMATION_CODE_TIMEOUT = 60
+        code = confirmation_codes.issue(DATA['username'])
+        assert not confirmation_codes.consume('someone_else', code)
+        assert confirmation_codes.consume(DATA['username'], code)
+
+    def test_05_purge_expired_codes(self, settings):
+        settings.CONFIRMATION_CODE_TIMEOUT = -1
+        confirmation_codes.issue('expired')
+        settings.CONFIRMATION_CODE_TIMEOUT = 60
+        code = confirmation_codes.issue(DATA['username'])
+        call_command('purge_confirmation_codes')
+        assert list(ConfirmationCode.objects.values_list(
+            'username', flat=True)) == [DATA['username']], (
+            'Проверьте, что purge_confirmation_codes удаляет только '
+            'истекшие коды.'
+        )
+        assert confirmation_codes.consume(DATA['username'], code)
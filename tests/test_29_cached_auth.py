@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import LRUCache
+from tests.utils import create_reviews
+
+
+def user_queries(queries):
+    return [query['sql'] for query in queries
+            if 'FROM "reviews_user"' in query['sql']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29CachedAuth:
+
+    def test_01_user_loaded_once(self, user_client):
+        user_client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get('/api/v1/categories/')
+        assert response.status_code == HTTPStatus.OK
+        assert user_queries(queries) == [], (
+            'Проверьте, что повторный запрос с тем же токеном '
+            'не загружает пользователя из базы.'
+        )
+        response = user_client.post('/api/v1/categories/',
+                                    data={'name': 'Н', 'slug': 'n'})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_role_change_invalidates(self, admin_client, admin,
+                                        user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        assert user_client.delete(url).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(f'/api/v1/users/{user.username}/',
+                                      data={'role': 'moderator'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.delete(url).status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что после смены роли права пользователя '
+            'обновляются без ожидания TTL кэша.'
+        )
+
+    def test_03_deleted_user(self, admin_client, user_client, user):
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK)
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED)
+
+    def test_04_profile_is_complete(self, user_client, user):
+        user_client.get('/api/v1/titles/')
+        response = user_client.patch('/api/v1/users/me/',
+                                     data={'bio': 'О себе'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        user.refresh_from_db()
+        assert user.bio == 'О себе'
+        assert user.email
+
+    def test_05_lru(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert (cache.get('a'), cache.get('b'), cache.get('c')) == (
+            1, None, 3)
+        cache.set('d', 4, ttl=0)
+        assert cache.get('d') is None
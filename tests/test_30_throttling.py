@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+
+from api import throttling
+from api.throttling import get_bucket_storage
+from tests.utils import create_titles
+
+SIGNUP = '/api/v1/auth/signup/'
+BUCKETS = {
+    'auth': {'capacity': 3, 'rate': 0.001},
+    'write': {'capacity': 2, 'rate': 0.001},
+}
+
+
+@pytest.fixture
+def buckets(settings):
+    settings.THROTTLE_BUCKETS = BUCKETS
+
+
+@pytest.fixture
+def cache_storage(settings):
+    settings.THROTTLE_STORAGE = 'api.throttling.CacheBucketStorage'
+    get_bucket_storage.cache_clear()
+    yield
+    get_bucket_storage.cache_clear()
+
+
+def signup(client, idx):
+    return client.post(SIGNUP, data={
+        'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'})
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Throttling:
+
+    def test_01_auth_is_throttled(self, client, buckets):
+        statuses = [signup(client, idx).status_code for idx in range(4)]
+        assert statuses == [HTTPStatus.OK] * 3 + [
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            'Проверьте, что запросы к /auth/ сверх емкости корзины '
+            'получают ответ 429.'
+        )
+        response = client.post('/api/v1/auth/token/', data={})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация и получение токена используют '
+            'одну корзину.'
+        )
+        assert int(response['Retry-After']) > 0
+
+    def test_02_writes_are_throttled(self, admin_client, user_client,
+                                     buckets):
+        titles, _, _ = create_titles(admin_client)
+        statuses = [
+            user_client.post(
+                f'/api/v1/titles/{title["id"]}/reviews/',
+                data={'text': 'Да', 'score': 5}
+            ).status_code for title in titles[:2] + titles[:1]
+        ]
+        assert statuses == [HTTPStatus.CREATED] * 2 + [
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            'Проверьте, что создание отзывов ограничено по частоте.'
+        )
+        response = user_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что чтение отзывов не ограничивается.'
+        )
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Да', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что корзины у разных пользователей независимы.'
+        )
+
+    def test_03_bucket_refills(self, client, buckets, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(throttling.time, 'time', lambda: now[0])
+        for idx in range(3):
+            signup(client, idx)
+        assert signup(client, 3).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        now[0] += 1 / BUCKETS['auth']['rate']
+        assert signup(client, 4).status_code == HTTPStatus.OK, (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+        assert signup(client, 5).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    def test_04_cache_storage(self, client, buckets, cache_storage):
+        statuses = [signup(client, idx).status_code for idx in range(4)]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS
+        assert any(
+            key.startswith(':1:throttle:auth:')
+            for key in caches['default']._cache
+        ), (
+            'Проверьте, что CacheBucketStorage хранит корзины в кэше.'
+        )
@@ -0,0 +1,132 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import OutgoingEmail, User
+
+URL = '/api/v1/provisioning/users/'
+
+
+def rows(count, prefix='partner'):
+    return [
+        {'username': f'{prefix}{idx}', 'email': f'{prefix}{idx}@yamdb.fake'}
+        for idx in range(count)
+    ]
+
+
+def selects(queries):
+    return sum(query['sql'].startswith('SELECT') for query in queries)
+
+
+def inserts(queries):
+    return sum(query['sql'].startswith('INSERT') for query in queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31BulkUsers:
+
+    def test_01_only_admin(self, client, user_client, moderator_client):
+        data = {'users': rows(1)}
+        assert client.post(
+            URL, data=data, format='json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        for role_client in (user_client, moderator_client):
+            response = role_client.post(URL, data=data, format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что массово создавать пользователей может '
+                'только администратор.'
+            )
+        assert not User.objects.filter(username='partner0').exists()
+
+    def test_02_per_row_results(self, admin_client, user):
+        data = {'users': [
+            {'username': 'first', 'email': 'first@yamdb.fake',
+             'role': 'moderator', 'bio': 'Партнер'},
+            {'username': 'me', 'email': 'me@yamdb.fake'},
+            {'username': 'second', 'email': 'not-an-email'},
+            {'username': user.username, 'email': 'taken@yamdb.fake'},
+            {'username': 'third', 'email': user.email},
+            {'username': 'first', 'email': 'first2@yamdb.fake'},
+            {'username': 'fourth', 'email': 'first@yamdb.fake'},
+            'строка',
+            {'username': 'fifth', 'email': 'fifth@yamdb.fake'},
+        ]}
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [row['status'] for row in results] == [
+            'created', 'error', 'error', 'error', 'error',
+            'error', 'error', 'error', 'created',
+        ], (
+            'Проверьте, что ответ содержит результат по каждой строке '
+            'в исходном порядке.'
+        )
+        assert response.json()['created'] == 2
+        assert 'username' in results[1]['errors']
+        assert 'email' in results[2]['errors']
+        assert 'username' in results[3]['errors']
+        assert 'email' in results[4]['errors']
+        assert 'username' in results[5]['errors'], (
+            'Проверьте, что повтор username внутри пачки отклоняется.'
+        )
+        assert 'email' in results[6]['errors'], (
+            'Проверьте, что повтор email внутри пачки отклоняется.'
+        )
+        first = User.objects.get(username='first')
+        assert (first.email, first.role, first.bio) == (
+            'first@yamdb.fake', 'moderator', 'Партнер'
+        )
+        assert User.objects.filter(username='fifth').exists()
+
+    def test_03_constant_queries(self, admin_client, admin):
+        admin_client.post(URL, data={'users': rows(5, 'warm')},
+                          format='json')
+        with CaptureQueriesContext(connection) as small:
+            admin_client.post(URL, data={'users': rows(10)}, format='json')
+        with CaptureQueriesContext(connection) as large:
+            response = admin_client.post(
+                URL, data={'users': rows(300, 'big')}, format='json')
+        assert response.json()['created'] == 300
+        assert selects(large) == selects(small), (
+            'Проверьте, что число проверок уникальности не зависит '
+            'от размера пачки: один запрос IN на поле.'
+        )
+        # SQLite делит bulk_create на пачки из-за лимита параметров.
+        assert inserts(large) < 10, (
+            'Проверьте, что пользователи создаются через bulk_create.'
+        )
+        assert User.objects.count() == 316
+
+    def test_04_send_codes(self, admin_client, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'eager'
+        response = admin_client.post(
+            URL, data={'users': rows(3), 'send_codes': True}, format='json')
+        assert response.json()['created'] == 3
+        assert OutgoingEmail.objects.count() == 3
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'partner{idx}@yamdb.fake' for idx in range(3)
+        ], (
+            'Проверьте, что новым пользователям уходят коды подтверждения.'
+        )
+        message = next(
+            message for message in mail.outbox
+            if message.to == ['partner0@yamdb.fake'])
+        code = re.match(r'(\w+) - ', message.body).group(1)
+        response = client.post('/api/v1/auth/token/', data={
+            'username': 'partner0', 'confirmation_code': code})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что код из письма позволяет получить токен.'
+        )
+
+    def test_05_no_codes_by_default(self, admin_client):
+        admin_client.post(URL, data={'users': rows(2)}, format='json')
+        assert OutgoingEmail.objects.count() == 0
+
+    def test_06_invalid_payload(self, admin_client):
+        for data in ({}, {'users': []}, {'users': 'partner'}):
+            response = admin_client.post(URL, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST